@@ -8,13 +8,14 @@ Antes de executar:
 """
 
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-from src.scrapper.scraper import SimplesVetScraper
 
 if __name__ == "__main__":
+    from src.scrapper.scraper import SimplesVetScraper
+
     scraper = SimplesVetScraper()
     success = scraper.run()
-    print("\nPressione Enter para sair...")
-    input()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    # Só aguarda o Enter quando há um terminal (execuções agendadas não ficam presas aqui)
+    if sys.stdin.isatty():
+        print("\nPressione Enter para sair...")
+        input()
+    sys.exit(0 if success else 1)
@@ -1,15 +1,29 @@
 __version__ = "1.0.0"
 
+import importlib
+
 from .config import Config
 from .logger import logger
-from .webdriver_manager import WebDriverManager
-from .simplesvet_actions import SimplesVetActions
-from .scraper import SimplesVetScraper
+
+# Classes que dependem de selenium, requests e pandas são importadas sob demanda: os processos
+# de conversão de PDF (spawn) importam só o pdf_converter, sem carregar o resto do pacote
+_LAZY_EXPORTS = {
+    'WebDriverManager': '.webdriver_manager',
+    'SimplesVetActions': '.simplesvet_actions',
+    'SimplesVetScraper': '.scraper',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'Config',
     'logger',
-    'WebDriverManager', 
+    'WebDriverManager',
     'SimplesVetActions',
     'SimplesVetScraper'
-]
\ No newline at end of file
+]
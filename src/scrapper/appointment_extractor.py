@@ -1,13 +1,41 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import os
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+from functools import lru_cache, partial
 from .config import Config
 from .webdriver_manager import WebDriverManager
-from .pdf_converter import PDFConverter
+from .pdf_converter import PDFConverter, PROCESS_CONTEXT, convert_pdf_job
+from .download_utils import setup_download_directory
 from .logger import logger
 
+# Número máximo de downloads de relatórios simultâneos
+MAX_CONCURRENT_DOWNLOADS = 4
+
+# Tamanho do buffer usado ao gravar os PDFs baixados
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Timeout (em segundos) das requisições de download dos relatórios
+DOWNLOAD_TIMEOUT = 30
+
+
+@lru_cache(maxsize=256)
+def _format_date_for_url(date_str: str) -> Optional[str]:
+    """Converte data de YYYY-MM-DD para DD/MM/YYYY (resultado memoizado)"""
+    try:
+        # Valida a data no formato YYYY-MM-DD
+        datetime.strptime(date_str, '%Y-%m-%d')
+        # Retorna no formato DD/MM/YYYY
+        return f"{date_str[8:10]}/{date_str[5:7]}/{date_str[0:4]}"
+    except ValueError as e:
+        logger.error(f"Erro ao converter data {date_str}: {str(e)}")
+        return None
+
 
 class AppointmentExtractor:
     """Extrator de agendamentos do SimplesVet"""
@@ -15,7 +43,20 @@ class AppointmentExtractor:
     def __init__(self, webdriver_manager: WebDriverManager, config: Config):
         self.webdriver_manager = webdriver_manager
         self.config = config
-        self.pdf_converter = PDFConverter()
+        pdf_config = self.config.get_pdf_config()
+        self.pdf_converter = PDFConverter(
+            pdf_config.get('backend', 'pdfplumber'), pdf_config.get('max_workers')
+        )
+        
+        # Sessão HTTP reutilizada entre downloads (mantém conexões abertas)
+        self._session = requests.Session()
+        # Uma conexão keep-alive por download simultâneo, reaproveitadas entre os meses
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=MAX_CONCURRENT_DOWNLOADS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self._session.mount('https://', adapter)
     
     def extract_appointments(self, start_date: str, end_date: str, month_str: str = None) -> List[Dict]:
         """Extrai agendamentos do período especificado via URL direta do relatório"""
@@ -29,26 +70,107 @@ class AppointmentExtractor:
             logger.error("Erro ao formatar datas")
             return []
         
+        request_args = self.prepare_session()
+        if not request_args:
+            return []
+        
         # Faz o download do PDF diretamente via URL
-        pdf_file = self.download_appointments_pdf_direct(formatted_start, formatted_end, month_str)
+        pdf_file = self.download_appointments_pdf_direct(formatted_start, formatted_end, month_str, request_args)
         if not pdf_file:
             logger.error("Falha ao fazer download do PDF de agendamentos")
             return []
         
+        return self._convert_appointments(pdf_file, start_date, end_date, month_str)
+    
+    def extract_appointments_batch(self, periods: List[Tuple[str, str, str]],
+                                   request_args: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+        """
+        Extrai agendamentos de vários meses, baixando os PDFs em paralelo
+        
+        Args:
+            periods: Lista de tuplas (data_inicio, data_fim, mes) no formato (YYYY-MM-DD, YYYY-MM-DD, YYYYMM)
+            request_args: Retorno de prepare_session(); obrigatório quando chamado fora da thread do driver
+            
+        Returns:
+            Dicionário {mes: lista de metadados} no mesmo formato de extract_appointments
+        """
+        results = {month_str: [] for _, _, month_str in periods}
+        
+        # Os downloads acontecem em threads e o driver do Selenium não é thread-safe,
+        # então todas usam o mesmo retrato de cookies e User-Agent
+        if request_args is None:
+            request_args = self.prepare_session()
+        if not request_args:
+            return results
+        
+        def download(period):
+            start_date, end_date, month_str = period
+            formatted_start = self._format_date_for_url(start_date)
+            formatted_end = self._format_date_for_url(end_date)
+            if not formatted_start or not formatted_end:
+                logger.error(f"Erro ao formatar datas de {month_str}")
+                return None
+            return self.download_appointments_pdf_direct(formatted_start, formatted_end, month_str, request_args)
+        
+        max_workers = max(1, min(len(periods), MAX_CONCURRENT_DOWNLOADS))
+        logger.info(f"Baixando {len(periods)} relatório(s) de agendamentos em paralelo...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pdf_files = list(executor.map(download, periods))
+        
+        downloaded = []
+        for (start_date, end_date, month_str), pdf_file in zip(periods, pdf_files):
+            if not pdf_file:
+                logger.error(f"Falha ao fazer download do PDF de agendamentos de {month_str}")
+                continue
+            downloaded.append((start_date, end_date, month_str, pdf_file))
+        
+        if not downloaded:
+            return results
+        
+        # A conversão é CPU-bound, então roda em processos separados
+        jobs = [(pdf_file, month_str) for _, _, month_str, pdf_file in downloaded]
+        if len(jobs) == 1:
+            conversions = [self.pdf_converter.convert_pdf_to_excel(*jobs[0])]
+        else:
+            conversions = self._convert_in_parallel(jobs)
+        
+        for (start_date, end_date, month_str, pdf_file), (excel_file, count) in zip(downloaded, conversions):
+            results[month_str] = self._summarize_appointments(
+                pdf_file, excel_file, count, start_date, end_date, month_str
+            )
+        
+        return results
+    
+    def _convert_in_parallel(self, jobs: List[Tuple[str, Optional[str]]]) -> List[Tuple[Optional[str], int]]:
+        """Converte vários PDFs para Excel em processos separados (retorna (Excel, contagem) de cada um)"""
+        try:
+            max_workers = max(1, min(len(jobs), os.cpu_count() or 1))
+            logger.info(f"Convertendo {len(jobs)} PDF(s) em paralelo...")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=PROCESS_CONTEXT) as executor:
+                convert = partial(convert_pdf_job, backend=self.pdf_converter.backend)
+                conversions = list(executor.map(convert, jobs))
+        except Exception as e:
+            logger.warning(f"Conversão em paralelo indisponível, convertendo em sequência: {e}")
+            conversions = [self.pdf_converter.convert_pdf_to_excel(*job) for job in jobs]
+        
+        return conversions
+    
+    def _convert_appointments(self, pdf_file: str, start_date: str, end_date: str, month_str: str = None) -> List[Dict]:
+        """Converte o PDF baixado para Excel e monta os metadados do período"""
         # Converte PDF para Excel e extrai dados estruturados
-        excel_file = self.pdf_converter.convert_pdf_to_excel(pdf_file, month_str)
+        excel_file, appointments_count = self.pdf_converter.convert_pdf_to_excel(pdf_file, month_str)
+        return self._summarize_appointments(
+            pdf_file, excel_file, appointments_count, start_date, end_date, month_str
+        )
+    
+    def _summarize_appointments(self, pdf_file: str, excel_file: Optional[str], appointments_count: int,
+                                start_date: str, end_date: str, month_str: str = None) -> List[Dict]:
+        """Monta os metadados do período a partir do PDF, do Excel gerado e da contagem da conversão"""
+        formatted_start = self._format_date_for_url(start_date)
+        formatted_end = self._format_date_for_url(end_date)
         
-        # Lê a quantidade de agendamentos do Excel gerado
-        appointments_count = 0
-        if excel_file and os.path.exists(excel_file):
-            try:
-                import pandas as pd
-                df = pd.read_excel(excel_file)
-                appointments_count = len(df)
-                logger.info(f"✅ Excel criado com sucesso: {excel_file}")
-                logger.info(f"Total de {appointments_count} agendamentos extraídos")
-            except Exception as e:
-                logger.warning(f"Erro ao ler Excel para contar agendamentos: {e}")
+        if excel_file:
+            logger.info(f"Total de {appointments_count} agendamentos extraídos")
         
         # Retorna lista com metadados incluindo a contagem real
         appointments = [{
@@ -66,22 +188,16 @@ class AppointmentExtractor:
     
     def _format_date_for_url(self, date_str: str) -> Optional[str]:
         """Converte data de YYYY-MM-DD para DD/MM/YYYY"""
-        try:
-            # Parse da data no formato YYYY-MM-DD
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            # Retorna no formato DD/MM/YYYY
-            return date_obj.strftime('%d/%m/%Y')
-        except ValueError as e:
-            logger.error(f"Erro ao converter data {date_str}: {str(e)}")
-            return None
+        return _format_date_for_url(date_str)
     
-    def download_appointments_pdf_direct(self, start_date: str, end_date: str, month_str: str = None) -> Optional[str]:
-        """Faz o download do PDF através da URL direta do relatório"""
+    def download_appointments_pdf_direct(self, start_date: str, end_date: str, month_str: str = None,
+                                         request_args: Optional[Dict] = None) -> Optional[str]:
+        """Faz o download do PDF através da URL direta do relatório (request_args vem de prepare_session)"""
         logger.info(f"Fazendo download direto do PDF para período {start_date} - {end_date}")
         
-        driver = self.webdriver_manager.driver
-        if not driver:
-            logger.error("Driver não disponível")
+        if request_args is None:
+            request_args = self.prepare_session()
+        if not request_args:
             return None
         
         try:
@@ -90,7 +206,7 @@ class AppointmentExtractor:
             logger.info(f"Acessando URL do relatório: {report_url}")
             
             # Configura diretório de download
-            download_dir = self._setup_download_directory()
+            download_dir = setup_download_directory()
             if not download_dir:
                 logger.error("Erro ao configurar diretório de download")
                 return None
@@ -104,162 +220,90 @@ class AppointmentExtractor:
             # Download direto via requests (mais rápido e confiável)
             logger.info("Fazendo download direto via requests...")
             
-            # Obter cookies da sessão do Selenium
-            cookies = driver.get_cookies()
-            session = requests.Session()
-            
-            for cookie in cookies:
-                session.cookies.set(cookie['name'], cookie['value'])
-            
-            # Headers similares ao navegador
-            headers = {
-                'User-Agent': driver.execute_script("return navigator.userAgent;"),
-                'Referer': 'https://app.simples.vet/'
-            }
-            
-            response = session.get(report_url, headers=headers, stream=True)
-            
-            if response.status_code == 200:
+            # O with devolve a conexão ao pool em qualquer saída (inclusive status de erro e exceções)
+            with self._session.get(report_url, stream=True, timeout=DOWNLOAD_TIMEOUT, **request_args) as response:
+                if response.status_code != 200:
+                    logger.error(f"Erro no download via requests: Status {response.status_code}")
+                    return None
+                
                 filename = f"{base_filename}.pdf"
                 file_path = os.path.join(download_dir, filename)
                 
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                logger.info(f"✅ PDF baixado via requests: {file_path}")
+                # Tamanho esperado (só é confiável quando o corpo não vem comprimido)
+                expected_size = -1
+                if not response.headers.get('Content-Encoding'):
+                    expected_size = int(response.headers.get('Content-Length', -1))
                 
-                # Remove arquivos doc.pdf duplicados que podem ter sido baixados automaticamente
-                self._cleanup_duplicate_pdfs(download_dir, base_filename)
-                
-                return file_path
-            else:
-                logger.error(f"Erro no download via requests: Status {response.status_code}")
+                # Copia o corpo da resposta direto para o disco com buffer de 1 MiB
+                response.raw.decode_content = True
+                with open(file_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_BUFFER_SIZE)
+            
+            # Sem Content-Length confiável, o copyfileobj ter chegado ao fim do corpo já basta
+            if expected_size >= 0 and os.path.getsize(file_path) != expected_size:
+                logger.error(f"Download do PDF incompleto: {file_path}")
+                # Não deixa o PDF truncado no disco para a próxima execução
+                os.unlink(file_path)
                 return None
             
-        except Exception as e:
-            logger.error(f"Erro ao fazer download do PDF: {str(e)}")
-            return None
-    
-    def _setup_download_directory(self) -> Optional[str]:
-        """Configura e cria diretório para downloads"""
-        try:
-            # Cria diretório 'downloads' no projeto se não existir (agora em scrapper, precisa subir 3 níveis)
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            download_dir = os.path.join(project_root, "downloads")
+            logger.info(f"✅ PDF baixado via requests: {file_path}")
             
-            if not os.path.exists(download_dir):
-                os.makedirs(download_dir)
-                logger.info(f"Diretório de download criado: {download_dir}")
+            # Remove arquivos doc.pdf duplicados que podem ter sido baixados automaticamente
+            self._cleanup_duplicate_pdfs(download_dir, base_filename)
             
-            return download_dir
+            return file_path
             
         except Exception as e:
-            logger.error(f"Erro ao configurar diretório de download: {str(e)}")
+            logger.error(f"Erro ao fazer download do PDF: {str(e)}")
             return None
     
-    def _wait_for_pdf_download(self, download_dir: str, timeout: int = 30, expected_name: str = None) -> Optional[str]:
-        """Aguarda o download do PDF ser concluído e renomeia se necessário"""
-        logger.info(f"Aguardando download do PDF em: {download_dir}")
+    def prepare_session(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Tira um retrato dos cookies e do User-Agent do navegador para as requisições HTTP
         
-        start_time = time.time()
-        initial_files = set(os.listdir(download_dir)) if os.path.exists(download_dir) else set()
+        Deve ser chamado na thread que controla o driver; as threads de download recebem
+        o retrato pronto e não enviam comandos ao WebDriver
         
-        while time.time() - start_time < timeout:
-            time.sleep(2)
-            
-            if not os.path.exists(download_dir):
-                continue
-                
-            current_files = set(os.listdir(download_dir))
-            new_files = current_files - initial_files
-            
-            # Procura por arquivos PDF que não sejam temporários
-            pdf_files = [f for f in new_files if f.endswith('.pdf') and not f.endswith('.tmp')]
-            
-            for file in pdf_files:
-                file_path = os.path.join(download_dir, file)
-                
-                # Verifica se o arquivo não está sendo escrito (tamanho estável)
-                if self._is_file_complete(file_path):
-                    logger.info(f"PDF encontrado: {file}")
-                    
-                    # Se temos um nome esperado e o arquivo não tem esse nome, renomeia
-                    if expected_name:
-                        expected_filename = f"{expected_name}.pdf"
-                        
-                        # Se o arquivo não é o esperado (ex: doc.pdf ao invés de 202510-agendamentos.pdf)
-                        if file != expected_filename:
-                            new_path = os.path.join(download_dir, expected_filename)
-                            try:
-                                # Se já existe um arquivo com esse nome, remove o antigo
-                                if os.path.exists(new_path):
-                                    logger.info(f"Removendo arquivo antigo: {expected_filename}")
-                                    os.remove(new_path)
-                                
-                                # Renomeia o arquivo baixado
-                                os.rename(file_path, new_path)
-                                logger.info(f"✅ Arquivo renomeado de '{file}' para '{expected_filename}'")
-                                return new_path
-                            except Exception as e:
-                                logger.warning(f"Erro ao renomear arquivo: {e}")
-                                return file_path
-                        else:
-                            logger.info(f"✅ Arquivo já tem o nome correto: {file}")
-                            return file_path
-                    
-                    # Se não tem nome esperado, retorna o que foi encontrado
-                    return file_path
-            
-            # Verifica se existe algum arquivo .crdownload (Chrome) sendo baixado
-            downloading_files = [f for f in current_files if f.endswith('.crdownload')]
-            if downloading_files:
-                logger.info("Download em progresso...")
-                continue
+        Returns:
+            Argumentos de requisição {'headers': ..., 'cookies': ...} ou None em caso de erro
+        """
+        driver = self.webdriver_manager.driver
+        if not driver:
+            logger.error("Driver não disponível")
+            return None
         
-        logger.warning(f"Timeout aguardando download do PDF ({timeout}s)")
-        return None
-    
-    def _is_file_complete(self, file_path: str) -> bool:
-        """Verifica se o arquivo foi completamente baixado"""
         try:
-            # Verifica o tamanho do arquivo duas vezes com intervalo
-            size1 = os.path.getsize(file_path)
-            time.sleep(1)
-            size2 = os.path.getsize(file_path)
-            
-            # Se o tamanho não mudou e é maior que 0, provavelmente terminou
-            return size1 == size2 and size1 > 0
-            
-        except Exception:
-            return False
+            # Headers similares ao navegador (User-Agent já cacheado pelo WebDriverManager)
+            headers = {
+                'User-Agent': self.webdriver_manager.get_user_agent(),
+                'Referer': 'https://app.simples.vet/'
+            }
+            cookies = {cookie['name']: cookie['value'] for cookie in driver.get_cookies()}
+            return {'headers': headers, 'cookies': cookies}
+        except Exception as e:
+            logger.error(f"Erro ao ler cookies do navegador: {e}")
+            return None
     
     def _cleanup_duplicate_pdfs(self, download_dir: str, expected_basename: str):
         """Remove PDFs duplicados (como doc.pdf) que não são o arquivo esperado"""
+        expected_filename = f"{expected_basename}.pdf"
+        
         try:
-            if not os.path.exists(download_dir):
-                return
-            
-            expected_filename = f"{expected_basename}.pdf"
-            files_to_remove = []
-            
-            # Procura por arquivos PDF que não são o esperado
-            for file in os.listdir(download_dir):
-                if file.endswith('.pdf') and file != expected_filename:
-                    # Remove arquivos como doc.pdf, doc (1).pdf, etc.
-                    if file.startswith('doc'):
-                        files_to_remove.append(file)
-            
-            # Remove os arquivos encontrados
-            for file in files_to_remove:
-                try:
-                    file_path = os.path.join(download_dir, file)
-                    os.remove(file_path)
-                    logger.info(f"🗑️  Removido arquivo duplicado: {file}")
-                except Exception as e:
-                    logger.warning(f"Erro ao remover arquivo duplicado {file}: {e}")
+            # Uma única varredura, considerando apenas arquivos como doc.pdf, doc (1).pdf, etc.
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith('doc') and name.endswith('.pdf')) or name == expected_filename:
+                        continue
+                    if not entry.is_file():
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        logger.info(f"🗑️  Removido arquivo duplicado: {name}")
+                    except OSError as e:
+                        logger.warning(f"Erro ao remover arquivo duplicado {name}: {e}")
                     
-        except Exception as e:
+        except OSError as e:
             logger.warning(f"Erro ao limpar arquivos duplicados: {e}")
 
     def set_date_filter(self, start_date: str, end_date: str) -> bool:
@@ -1,12 +1,60 @@
+import copy
 import json
 import os
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from datetime import datetime
 from calendar import monthrange
+from functools import cached_property, lru_cache
+
+try:
+    import orjson  # opcional, parser JSON mais rápido
+except ImportError:
+    orjson = None
+
+
+# Arquivo de configuração padrão (módulo em src/scrapper/, então parent.parent.parent é a raiz)
+DEFAULT_CONFIG_FILE = os.path.join(Path(__file__).parent.parent.parent, 'config', 'config.json')
+
+# Valores de exemplo do template que indicam credencial não configurada
+CREDENTIAL_PLACEHOLDERS = {
+    'email': 'SEU_EMAIL_AQUI',
+    'password': 'SUA_SENHA_AQUI'
+}
+
+
+@lru_cache(maxsize=128)
+def _date_range_from_month(month_str: str) -> Tuple[str, str]:
+    """Converte YYYYMM em (primeiro dia, último dia) no formato YYYY-MM-DD (resultado memoizado)"""
+    try:
+        # Valida o formato
+        if len(month_str) != 6 or not month_str.isdigit():
+            raise ValueError(f"Formato de mês inválido: {month_str}. Use YYYYMM (ex: 202509)")
+        
+        year = int(month_str[:4])
+        month = int(month_str[4:])
+        
+        if month < 1 or month > 12:
+            raise ValueError(f"Mês inválido: {month}. Deve estar entre 01 e 12")
+        
+        # Primeiro dia do mês
+        start_date = f"{year:04d}-{month:02d}-01"
+        
+        # Último dia do mês
+        last_day = monthrange(year, month)[1]
+        end_date = f"{year:04d}-{month:02d}-{last_day:02d}"
+        
+        return start_date, end_date
+        
+    except Exception as e:
+        raise ValueError(f"Erro ao processar mês {month_str}: {e}")
 
 
 class Config:
+    # Cache de configurações já carregadas, por (caminho absoluto, mtime). Cada instância
+    # recebe uma cópia: alterações nos dados de uma não vazam para as outras nem para o cache
+    _cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    
     def __init__(self, config_file: str = None):
         """
         Inicializa o gerenciador de configurações
@@ -15,13 +63,19 @@ class Config:
             config_file: Caminho para o arquivo de configuração
         """
         if config_file is None:
-            # Agora está em src/scrapper/, então parent.parent.parent vai para a raiz
-            config_file = os.path.join(
-                Path(__file__).parent.parent.parent, 'config', 'config.json'
-            )
+            config_file = DEFAULT_CONFIG_FILE
         
         self.config_file = config_file
-        self._config_data = self._load_config()
+    
+    @cached_property
+    def _config_data(self) -> Dict[str, Any]:
+        """
+        Conteúdo do arquivo de configuração, carregado só no primeiro acesso
+        
+        Returns:
+            Dict contendo as configurações
+        """
+        return self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -31,8 +85,19 @@ class Config:
             Dict contendo as configurações
         """
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as file:
-                return json.load(file)
+            # Reutiliza o conteúdo já carregado se o arquivo não mudou
+            st = os.stat(self.config_file)
+            key = (os.path.abspath(self.config_file), st.st_mtime_ns)
+            cached = Config._cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
+            # orjson (quando instalado) faz o parse direto dos bytes, bem mais rápido que o json
+            raw = Path(self.config_file).read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            
+            Config._cache[key] = data
+            return copy.deepcopy(data)
         except FileNotFoundError:
             raise FileNotFoundError(f"Arquivo de configuração não encontrado: {self.config_file}")
         except json.JSONDecodeError as e:
@@ -75,7 +140,8 @@ class Config:
             credentials = self.get_config(section, 'credentials')
             value = credentials.get(credential)
             
-            if value and value.upper() != f"SEU_{credential.upper()}_AQUI":
+            placeholder = CREDENTIAL_PLACEHOLDERS.get(credential) or f"SEU_{credential.upper()}_AQUI"
+            if value and value.upper() != placeholder:
                 return value
             
             return None
@@ -110,28 +176,11 @@ class Config:
         Returns:
             Tupla com (data_inicio, data_fim) no formato YYYY-MM-DD
         """
-        try:
-            # Valida o formato
-            if len(month_str) != 6 or not month_str.isdigit():
-                raise ValueError(f"Formato de mês inválido: {month_str}. Use YYYYMM (ex: 202509)")
-            
-            year = int(month_str[:4])
-            month = int(month_str[4:])
-            
-            if month < 1 or month > 12:
-                raise ValueError(f"Mês inválido: {month}. Deve estar entre 01 e 12")
-            
-            # Primeiro dia do mês
-            start_date = f"{year:04d}-{month:02d}-01"
-            
-            # Último dia do mês
-            last_day = monthrange(year, month)[1]
-            end_date = f"{year:04d}-{month:02d}-{last_day:02d}"
-            
-            return start_date, end_date
-            
-        except Exception as e:
-            raise ValueError(f"Erro ao processar mês {month_str}: {e}")
+        # O lru_cache faz hash do argumento antes de validar: entradas não-str (ex: lista)
+        # gerariam TypeError em vez do ValueError esperado por quem valida a configuração
+        if not isinstance(month_str, str):
+            raise ValueError(f"Formato de mês inválido: {month_str!r}. Use YYYYMM (ex: 202509)")
+        return _date_range_from_month(month_str)
     
     def validate_credentials(self, section: str = 'simplesvet') -> bool:
         """
@@ -143,17 +192,10 @@ class Config:
         Returns:
             True se as credenciais estão válidas
         """
-        email = self.get_credential(section, 'email')
-        password = self.get_credential(section, 'password')
-        
-        if not email or not password:
-            return False
-        
-        # Verifica se não são os valores padrão do template
-        if email.upper() == "SEU_EMAIL_AQUI" or password.upper() == "SUA_SENHA_AQUI":
-            return False
-        
-        return True
+        # get_credential já descarta os valores de exemplo do template
+        return bool(
+            self.get_credential(section, 'email') and self.get_credential(section, 'password')
+        )
     
     def get_browser_config(self) -> Dict[str, Any]:
         """
@@ -171,4 +213,16 @@ class Config:
         Returns:
             Dict com configurações de logging
         """
-        return self.get_config('logging')
\ No newline at end of file
+        return self.get_config('logging')
+    
+    def get_pdf_config(self) -> Dict[str, Any]:
+        """
+        Obtém as configurações de leitura de PDF (seção opcional)
+        
+        Returns:
+            Dict com configurações de PDF ou vazio se a seção não existir
+        """
+        try:
+            return self.get_config('pdf')
+        except KeyError:
+            return {}
\ No newline at end of file
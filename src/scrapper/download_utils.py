@@ -0,0 +1,27 @@
+import os
+from typing import Optional
+from .logger import logger
+
+# Diretório 'downloads' na raiz do projeto (em src/scrapper, precisa subir 3 níveis)
+DOWNLOAD_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "downloads"
+)
+
+
+def setup_download_directory(subdir: Optional[str] = None) -> Optional[str]:
+    """
+    Configura e cria o diretório de downloads do projeto
+    
+    Args:
+        subdir: Subdiretório dentro de 'downloads' (opcional)
+    
+    Returns:
+        Caminho do diretório 'downloads' na raiz do projeto (ou do subdiretório) ou None em caso de erro
+    """
+    download_dir = os.path.join(DOWNLOAD_DIR, subdir) if subdir else DOWNLOAD_DIR
+    try:
+        os.makedirs(download_dir, exist_ok=True)
+        return download_dir
+    except OSError as e:
+        logger.error(f"Erro ao configurar diretório de download: {str(e)}")
+        return None
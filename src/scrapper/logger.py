@@ -1,9 +1,15 @@
 import logging
+import multiprocessing
 import os
+from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Diretório de logs (módulo em src/scrapper/, precisa subir 2 níveis).
+# SIMPLESVET_LOG_DIR permite redirecionar os logs (os testes usam um diretório temporário)
+LOG_DIR = Path(os.environ.get('SIMPLESVET_LOG_DIR') or Path(__file__).parent.parent.parent / 'logs')
+
 
 class Logger:
     def __init__(self, name: str = "SimplesVetScraper", level: str = "INFO", file_enabled: bool = True):
@@ -32,8 +38,10 @@ class Logger:
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
         
-        # File handler (se habilitado)
-        if file_enabled:
+        # File handler (se habilitado). Processos filhos (conversão de PDF) só logam no console:
+        # vários RotatingFileHandler no mesmo arquivo quebram a rotação. O nome do processo já vale
+        # enquanto o spawn ainda prepara o filho, antes de parent_process() estar definido
+        if file_enabled and multiprocessing.current_process().name == 'MainProcess':
             self._setup_file_handler(formatter)
     
     def _setup_file_handler(self, formatter: logging.Formatter):
@@ -44,16 +52,13 @@ class Logger:
             formatter: Formatter para os logs
         """
         try:
-            # Diretório de logs (agora em scrapper, precisa subir 2 níveis)
-            log_dir = Path(__file__).parent.parent.parent / 'logs'
-            log_dir.mkdir(exist_ok=True)
+            LOG_DIR.mkdir(exist_ok=True)
             
             # Nome do arquivo com timestamp
             timestamp = datetime.now().strftime('%Y%m%d')
-            log_file = log_dir / f'simplesvet_scraper_{timestamp}.log'
+            log_file = LOG_DIR / f'simplesvet_scraper_{timestamp}.log'
             
             # File handler com rotação por tamanho
-            from logging.handlers import RotatingFileHandler
             file_handler = RotatingFileHandler(
                 log_file,
                 maxBytes=10*1024*1024,  # 10MB
@@ -66,25 +71,25 @@ class Logger:
         except Exception as e:
             self.logger.warning(f"Não foi possível configurar log em arquivo: {e}")
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log de debug"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log de informação"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log de aviso"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log de erro"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """Log crítico"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
 
 
 # Instância global do logger
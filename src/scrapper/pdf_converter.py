@@ -1,138 +1,320 @@
 import os
 import re
-from typing import List, Dict, Optional
-import pandas as pd
+import traceback
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import List, Dict, Optional, Iterator, Tuple, Callable
 import pdfplumber
-from datetime import datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.utils import get_column_letter
+from calendar import monthrange
 from .logger import logger
 
+try:
+    import fitz  # PyMuPDF (opcional, backend alternativo mais rápido)
+except ImportError:
+    fitz = None
+
+# Padrões compilados uma única vez no carregamento do módulo
+# Data DD/MM/YYYY (só dígitos ASCII; usado com fullmatch, sem aceitar '\n' no final)
+DATE_RE = re.compile(r'([0-9]{2})/([0-9]{2})/([0-9]{4})')
+
+# Linhas candidatas a nome de veterinário: ao menos 6 caracteres (sem contar espaços nas
+# pontas) e sem as palavras que indicam cabeçalho de tabela
+VET_LINE_RE = re.compile(
+    r'^[^\S\n]*(?![^\n]*(?:cliente|animal|data|hora|status|agenda))(\S[^\n]{4,}\S)[^\S\n]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Trechos que identificam linhas de observação nas tabelas (não são agendamentos)
+OBSERVATION_KEYWORDS = (
+    'paga na hora',
+    'valor normal',
+    'valor',
+    'observ',
+    'v4',
+    'v5',
+    'queixa:',
+    'contato de quem',
+    'endereço completo',
+    'sem custo',
+    '2° dose',
+    'dose v'
+)
+SKIP_ROW_RE = re.compile('|'.join(re.escape(k) for k in OBSERVATION_KEYWORDS), re.IGNORECASE)
+
+# Trecho do cabeçalho -> campo do agendamento, na ordem de prioridade da busca
+HEADER_FIELDS = (
+    ('cliente', 'cliente'),
+    ('animal', 'animal'),
+    ('tipo', 'tipo_atendimento'),
+    ('atendimento', 'tipo_atendimento'),
+    ('data', 'data'),
+    ('hora', 'hora'),
+    ('status', 'status'),
+)
+
+# Colunas da planilha de agendamentos, na ordem em que são gravadas
+EXCEL_COLUMNS = ('veterinario', 'cliente', 'animal', 'tipo_atendimento', 'data', 'hora', 'status')
+
+# Estilos do cabeçalho da planilha, criados uma única vez
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+# Quantidade mínima de páginas para processar o PDF em paralelo
+PARALLEL_PAGES_MIN = 8
+
+# Os pools de processos são criados com spawn: o fork copiaria um processo com várias threads
+# (Selenium, downloads em segundo plano) e o filho poderia travar num lock herdado
+PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+# Quantidade de páginas abertas por vez no processamento sequencial
+PAGE_BATCH_SIZE = 500
+
+# Backends de leitura de PDF suportados
+PDF_BACKENDS = ('pdfplumber', 'pymupdf')
+
+
+def _extract_page_appointments(job: Tuple[str, int]) -> List[Dict]:
+    """Extrai os agendamentos de uma única página em um processo separado"""
+    pdf_path, page_num = job
+    with pdfplumber.open(pdf_path, pages=[page_num + 1]) as pdf:
+        return list(PDFConverter()._iter_page_appointments(pdf.pages[0], page_num))
+
+
+def convert_pdf_job(job: Tuple[str, Optional[str]], backend: str = 'pdfplumber') -> Tuple[Optional[str], int]:
+    """Converte um PDF (pdf, mês) em um processo separado (instancia o conversor localmente)"""
+    # Fica neste módulo para que o processo filho importe só o conversor, não o extrator (selenium, requests)
+    pdf_file, month_str = job
+    return PDFConverter(backend).convert_pdf_to_excel(pdf_file, month_str)
+
 
 class PDFConverter:
-    """Conversor de PDFs de agendamentos para Excel"""
+    """
+    Conversor de PDFs de agendamentos para Excel
     
-    def __init__(self):
-        pass
+    O PDF é lido página a página: os agendamentos são gerados à medida que
+    cada tabela é processada, sem acumular listas intermediárias no parser.
+    """
     
-    def convert_pdf_to_excel(self, pdf_path: str, month_str: str = None) -> Optional[str]:
-        """Converte PDF de agendamentos para Excel com dados estruturados"""
-        logger.info(f"Iniciando conversão do PDF: {pdf_path}")
+    # Mapeamento de colunas já calculado, por cabeçalho normalizado (igual entre tabelas e páginas)
+    _header_cache: Dict[Tuple[str, ...], Dict[str, int]] = {}
+    
+    def __init__(self, backend: str = 'pdfplumber', max_workers: Optional[int] = None):
+        """
+        Inicializa o conversor
         
-        if not os.path.exists(pdf_path):
-            logger.error(f"Arquivo PDF não encontrado: {pdf_path}")
-            return None
+        Args:
+            backend: Biblioteca de leitura do PDF ('pdfplumber' ou 'pymupdf')
+            max_workers: Limite de processos na extração paralela de páginas (padrão: nº de CPUs)
+        """
+        backend = (backend or 'pdfplumber').lower()
+        if backend not in PDF_BACKENDS:
+            logger.warning(f"Backend de PDF não suportado: {backend}. Usando pdfplumber")
+            backend = 'pdfplumber'
+        elif backend == 'pymupdf' and fitz is None:
+            logger.warning("PyMuPDF não está instalado. Usando pdfplumber")
+            backend = 'pdfplumber'
+        self.backend = backend
+        self.max_workers = max_workers
+    
+    def convert_pdf_to_excel(self, pdf_path: str, month_str: str = None) -> Tuple[Optional[str], int]:
+        """
+        Converte PDF de agendamentos para Excel com dados estruturados
+        
+        Returns:
+            Tupla (caminho do Excel ou None, quantidade de agendamentos gravados)
+        """
+        logger.info(f"Iniciando conversão do PDF: {pdf_path}")
         
         try:
-            # Extrai dados do PDF
-            appointments_data = self._extract_appointments_from_pdf(pdf_path)
+            # Extrai dados do PDF já como linhas na ordem das colunas da planilha
+            rows = [
+                tuple(appointment.get(col, '') for col in EXCEL_COLUMNS)
+                for appointment in self._iter_appointments_from_pdf(pdf_path)
+            ]
             
-            if not appointments_data:
+            if not rows:
                 logger.warning("Nenhum agendamento encontrado no PDF")
-                return None
+                return None, 0
             
-            # Converte para DataFrame
-            df = pd.DataFrame(appointments_data)
+            # Cria nome do arquivo Excel trocando apenas a extensão do PDF
+            excel_path = str(Path(pdf_path).with_suffix('.xlsx'))
             
-            # Reordena as colunas para ficar mais organizado
-            column_order = ['veterinario', 'cliente', 'animal', 'tipo_atendimento', 'data', 'hora', 'status']
-            existing_columns = [col for col in column_order if col in df.columns]
-            df = df[existing_columns]
+            # Calcula a largura das colunas (maior texto + 2, limitado a 50)
+            widths = [
+                min(max(len(col), max(len(str(row[idx])) for row in rows)) + 2, 50)
+                for idx, col in enumerate(EXCEL_COLUMNS)
+            ]
             
-            # Cria nome do arquivo Excel
-            if month_str:
-                # Remove extensão .pdf e adiciona .xlsx
-                base_path = pdf_path.replace('.pdf', '')
-                excel_path = f"{base_path}.xlsx"
-            else:
-                excel_path = pdf_path.replace('.pdf', '.xlsx')
+            # Salva como Excel em modo write-only (linhas gravadas em fluxo, sem grade de células em memória)
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Agendamentos')
             
-            # Salva como Excel
-            with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Agendamentos', index=False)
-                
-                # Ajusta largura das colunas
-                worksheet = writer.sheets['Agendamentos']
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Ajusta largura das colunas (precisa ser feito antes da primeira linha)
+            for idx, width in enumerate(widths, start=1):
+                worksheet.column_dimensions[get_column_letter(idx)].width = width
+            
+            # Cabeçalho em negrito com borda (mesmo estilo do pandas), com estilos compartilhados entre as células
+            header = []
+            for col in EXCEL_COLUMNS:
+                cell = WriteOnlyCell(worksheet, value=col)
+                cell.font = HEADER_FONT
+                cell.border = HEADER_BORDER
+                cell.alignment = HEADER_ALIGNMENT
+                header.append(cell)
+            worksheet.append(header)
+            for row in rows:
+                worksheet.append(row)
+            workbook.save(excel_path)
             
             logger.info(f"✅ Excel criado com sucesso: {excel_path}")
-            logger.info(f"Total de agendamentos processados: {len(appointments_data)}")
+            logger.info(f"Total de agendamentos processados: {len(rows)}")
             
-            return excel_path
+            # A planilha write-only não grava as dimensões, então a contagem sai daqui e não de uma releitura
+            return excel_path, len(rows)
             
+        except FileNotFoundError:
+            # A abertura do PDF já acusa arquivo inexistente, sem checagem prévia
+            logger.error(f"Arquivo PDF não encontrado: {pdf_path}")
+            return None, 0
         except Exception as e:
             logger.error(f"Erro ao converter PDF para Excel: {str(e)}")
-            import traceback
             logger.error(traceback.format_exc())
-            return None
+            return None, 0
     
-    def _extract_appointments_from_pdf(self, pdf_path: str) -> List[Dict]:
-        """Extrai dados de agendamentos do PDF"""
-        appointments = []
+    def _iter_appointments_from_pdf(self, pdf_path: str) -> Iterator[Dict]:
+        """Gera os agendamentos do PDF página a página"""
+        if self.backend == 'pymupdf':
+            yield from self._iter_appointments_pymupdf(pdf_path)
+            return
+        
+        total = 0
         
         try:
             with pdfplumber.open(pdf_path) as pdf:
-                logger.info(f"PDF aberto. Total de páginas: {len(pdf.pages)}")
+                page_count = len(pdf.pages)
+            logger.info(f"PDF aberto. Total de páginas: {page_count}")
+            
+            # PDFs pequenos (ou já dentro de um processo de conversão) são processados aqui mesmo
+            if page_count < PARALLEL_PAGES_MIN or multiprocessing.parent_process() is not None:
+                yield from self._iter_pages_sequential(pdf_path, page_count)
+                return
+            
+            # Páginas são independentes: processa em paralelo, preservando a ordem
+            max_workers = max(1, min(page_count, self.max_workers or os.cpu_count() or 1))
+            logger.info(f"Processando {page_count} páginas em {max_workers} processos...")
+            done = 0
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, mp_context=PROCESS_CONTEXT) as executor:
+                    jobs = zip(repeat(pdf_path), range(page_count))
+                    for page_appointments in executor.map(_extract_page_appointments, jobs):
+                        total += len(page_appointments)
+                        done += 1
+                        yield from page_appointments
+                        logger.info("Total de agendamentos até a página %d: %d", done, total)
+                return
+            except Exception as e:
+                # Falha do pool (spawn, pickling, BrokenProcessPool): segue em sequência a partir da
+                # primeira página ainda não entregue, sem repetir as que já foram geradas
+                logger.warning(f"Processamento paralelo indisponível, continuando em sequência "
+                               f"a partir da página {done + 1}: {e}")
+            yield from self._iter_pages_sequential(pdf_path, page_count, done, total)
+        
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao processar PDF: {str(e)}")
+            logger.error(traceback.format_exc())
+    
+    def _iter_pages_sequential(self, pdf_path: str, page_count: int, first_page: int = 0,
+                               total: int = 0) -> Iterator[Dict]:
+        """Gera os agendamentos das páginas a partir de first_page neste processo"""
+        # Abre o PDF em janelas de páginas para limitar a memória em arquivos grandes
+        for start in range(first_page, page_count, PAGE_BATCH_SIZE):
+            page_numbers = list(range(start + 1, min(start + PAGE_BATCH_SIZE, page_count) + 1))
+            with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+                for page_num, page in enumerate(pdf.pages, start=start):
+                    for appointment in self._iter_page_appointments(page, page_num):
+                        total += 1
+                        yield appointment
+                    # Libera os objetos já processados da página
+                    page.flush_cache()
+                    logger.info("Total de agendamentos até a página %d: %d", page_num + 1, total)
+    
+    def _iter_appointments_pymupdf(self, pdf_path: str) -> Iterator[Dict]:
+        """Gera os agendamentos do PDF página a página usando PyMuPDF"""
+        total = 0
+        
+        try:
+            with fitz.open(pdf_path) as doc:
+                logger.info(f"PDF aberto. Total de páginas: {doc.page_count}")
                 
-                for page_num, page in enumerate(pdf.pages):
-                    logger.info(f"Processando página {page_num + 1}...")
-                    
-                    # Extrai tabelas da página (método mais eficiente para PDFs estruturados)
-                    tables = page.extract_tables()
-                    
-                    if tables:
-                        logger.info(f"Encontradas {len(tables)} tabelas na página {page_num + 1}")
-                        
-                        # Extrai também o texto para pegar os nomes dos veterinários
-                        text = page.extract_text()
-                        veterinarios = self._extract_veterinario_names(text)
-                        
-                        vet_index = 0
-                        for table_idx, table in enumerate(tables):
-                            if not table or len(table) < 2:
-                                continue
-                            
-                            # Pega o nome do veterinário correspondente
-                            veterinario = veterinarios[vet_index] if vet_index < len(veterinarios) else ''
-                            
-                            # Processa a tabela
-                            table_appointments = self._parse_simplesvet_table(table, veterinario)
-                            appointments.extend(table_appointments)
-                            
-                            logger.info(f"Tabela {table_idx + 1}: {len(table_appointments)} agendamentos extraídos")
-                            vet_index += 1
-                    else:
-                        logger.warning("Nenhuma tabela encontrada na página")
-                    
-                    logger.info(f"Total de agendamentos na página {page_num + 1}: {len(appointments)}")
+                for page_num, page in enumerate(doc):
+                    logger.info("Processando página %d...", page_num + 1)
+                    tables = [table.extract() for table in page.find_tables().tables]
+                    for appointment in self._iter_tables_appointments(tables, page.get_text, page_num):
+                        total += 1
+                        yield appointment
+                    logger.info("Total de agendamentos até a página %d: %d", page_num + 1, total)
         
+        except FileNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Erro ao processar PDF: {str(e)}")
-            import traceback
             logger.error(traceback.format_exc())
+    
+    def _iter_page_appointments(self, page, page_num: int) -> Iterator[Dict]:
+        """Gera os agendamentos de uma página do PDF (pdfplumber)"""
+        logger.info("Processando página %d...", page_num + 1)
         
-        return appointments
+        # Extrai tabelas da página (método mais eficiente para PDFs estruturados)
+        tables = page.extract_tables()
+        yield from self._iter_tables_appointments(tables, page.extract_text, page_num)
     
-    def _extract_veterinario_names(self, text: str) -> List[str]:
-        """Extrai nomes dos veterinários do texto"""
-        veterinarios = []
-        lines = text.split('\n')
+    def _iter_tables_appointments(self, tables: List[List[List]], get_text: Callable[[], str],
+                                  page_num: int) -> Iterator[Dict]:
+        """Gera os agendamentos das tabelas de uma página, independente do backend"""
+        if not tables:
+            logger.warning("Nenhuma tabela encontrada na página")
+            return
         
-        for line in lines:
-            line = line.strip()
-            # Veterinários geralmente estão em linhas com fundo colorido, em maiúsculas
-            if line.isupper() and len(line) > 5 and not any(x in line.lower() for x in ['cliente', 'animal', 'data', 'hora', 'status', 'agenda']):
-                veterinarios.append(line)
+        logger.info("Encontradas %d tabelas na página %d", len(tables), page_num + 1)
+        
+        # Extrai também o texto para pegar os nomes dos veterinários
+        text = get_text()
+        veterinarios = self._extract_veterinario_names(text)
+        
+        vet_index = 0
+        for table_idx, table in enumerate(tables):
+            if not table or len(table) < 2:
+                continue
+            
+            # Pega o nome do veterinário correspondente
+            veterinario = veterinarios[vet_index] if vet_index < len(veterinarios) else ''
+            
+            # Processa a tabela
+            table_appointments = self._parse_simplesvet_table(table, veterinario)
+            yield from table_appointments
+            
+            logger.info("Tabela %d: %d agendamentos extraídos", table_idx + 1, len(table_appointments))
+            vet_index += 1
+    
+    @staticmethod
+    def _extract_veterinario_names(text: str) -> List[str]:
+        """Extrai nomes dos veterinários do texto"""
+        # Veterinários geralmente estão em linhas com fundo colorido, em maiúsculas
+        veterinarios = [
+            match.group(1) for match in VET_LINE_RE.finditer(text)
+            if match.group(1).isupper()
+        ]
         
-        logger.info(f"Veterinários encontrados: {veterinarios}")
+        logger.info("Veterinários encontrados: %s", veterinarios)
         return veterinarios
     
     def _parse_simplesvet_table(self, table: List[List], veterinario: str = '') -> List[Dict]:
@@ -144,64 +326,30 @@ class PDFConverter:
                 return appointments
             
             # Procura pela linha de cabeçalho real (contém "Cliente", "Animal", etc)
-            header_row_idx = None
-            headers = None
-            
-            for idx, row in enumerate(table):
-                if row and any(cell and 'cliente' in str(cell).lower() for cell in row):
-                    header_row_idx = idx
-                    headers = row
-                    break
+            header_row_idx = next(
+                (idx for idx, row in enumerate(table)
+                 if row and any(cell and 'cliente' in str(cell).lower() for cell in row)),
+                None
+            )
             
-            if header_row_idx is None or headers is None:
+            if header_row_idx is None:
                 logger.warning(f"Cabeçalho não encontrado na tabela. Primeira linha: {table[0] if table else 'vazio'}")
                 return appointments
             
-            logger.info(f"Cabeçalhos encontrados na linha {header_row_idx}: {headers}")
+            headers = table[header_row_idx]
+            logger.info("Cabeçalhos encontrados na linha %d: %s", header_row_idx, headers)
             
             # Identifica índices das colunas baseado no cabeçalho
-            col_indices = {}
-            for idx, header in enumerate(headers):
-                if not header:
-                    continue
-                header_lower = str(header).strip().lower()
-                
-                if 'cliente' in header_lower:
-                    col_indices['cliente'] = idx
-                elif 'animal' in header_lower:
-                    col_indices['animal'] = idx
-                elif 'tipo' in header_lower or 'atendimento' in header_lower:
-                    col_indices['tipo_atendimento'] = idx
-                elif 'data' in header_lower:
-                    col_indices['data'] = idx
-                elif 'hora' in header_lower:
-                    col_indices['hora'] = idx
-                elif 'status' in header_lower:
-                    col_indices['status'] = idx
-            
-            logger.info(f"Mapeamento de colunas: {col_indices}")
+            col_indices = self._map_header_columns(headers)
             
             # Processa cada linha de dados (após o cabeçalho)
-            for row_idx, row in enumerate(table[header_row_idx + 1:], start=header_row_idx + 1):
-                if not row or all(not cell or str(cell).strip() == '' for cell in row):
+            for row_idx, row in enumerate(islice(table, header_row_idx + 1, None), start=header_row_idx + 1):
+                if not row or not any(cell and str(cell).strip() for cell in row):
                     continue
                 
                 # Pula linhas que são observações (ex: "Paga na hora", "Vacinação", etc)
-                first_cell = str(row[0]).strip() if row and row[0] else ''
-                if any(x in first_cell.lower() for x in [
-                    'paga na hora', 
-                    'valor normal',
-                    'valor',
-                    'observ',
-                    'v4', 
-                    'v5',
-                    'queixa:',
-                    'contato de quem',
-                    'endereço completo',
-                    'sem custo',
-                    '2° dose',
-                    'dose v'
-                ]):
+                first_cell = str(row[0]).strip() if row[0] else ''
+                if SKIP_ROW_RE.search(first_cell):
                     continue
                 
                 # Extrai dados usando os índices identificados
@@ -218,22 +366,42 @@ class PDFConverter:
                 # Validação: só adiciona se tiver data válida (formato DD/MM/YYYY)
                 # Isso filtra linhas de observação que não têm data
                 if not self._is_valid_date(appointment['data']):
-                    logger.debug(f"Linha ignorada (sem data válida): {first_cell[:50]}")
+                    logger.debug("Linha ignorada (sem data válida): %.50s", first_cell)
                     continue
                 
                 # Só adiciona se tiver pelo menos cliente ou animal
                 if appointment['cliente'] or appointment['animal']:
                     appointments.append(appointment)
-                    logger.debug(f"Agendamento extraído: {appointment}")
         
         except Exception as e:
             logger.error(f"Erro ao processar tabela: {str(e)}")
-            import traceback
             logger.error(traceback.format_exc())
         
         return appointments
     
-    def _get_cell_value(self, row: List, col_index: Optional[int]) -> str:
+    def _map_header_columns(self, headers: List) -> Dict[str, int]:
+        """Mapeia os campos para os índices das colunas (cacheado por cabeçalho)"""
+        key = tuple(str(h).strip().lower() if h else '' for h in headers)
+        col_indices = PDFConverter._header_cache.get(key)
+        if col_indices is not None:
+            return col_indices
+        
+        col_indices = {}
+        for idx, header_lower in enumerate(key):
+            if not header_lower:
+                continue
+            
+            # Primeiro trecho encontrado define o campo
+            field = next((f for sub, f in HEADER_FIELDS if sub in header_lower), None)
+            if field is not None:
+                col_indices[field] = idx
+        
+        logger.info("Mapeamento de colunas: %s", col_indices)
+        PDFConverter._header_cache[key] = col_indices
+        return col_indices
+    
+    @staticmethod
+    def _get_cell_value(row: List, col_index: Optional[int]) -> str:
         """Obtém valor de uma célula com segurança"""
         if col_index is None or col_index >= len(row):
             return ''
@@ -244,20 +412,19 @@ class PDFConverter:
         
         return str(value).strip()
     
-    def _is_valid_date(self, date_str: str) -> bool:
+    @staticmethod
+    def _is_valid_date(date_str: str) -> bool:
         """Verifica se a string é uma data válida no formato DD/MM/YYYY"""
         if not date_str or date_str.strip() == '':
             return False
         
         # Verifica se tem o formato DD/MM/YYYY
-        import re
-        date_pattern = r'^\d{2}/\d{2}/\d{4}$'
-        if not re.match(date_pattern, date_str):
+        match = DATE_RE.fullmatch(date_str)
+        if not match:
             return False
         
-        # Tenta parsear a data para ver se é válida
-        try:
-            datetime.strptime(date_str, '%d/%m/%Y')
-            return True
-        except:
+        # Valida dia e mês sem passar pelo strptime
+        day, month, year = map(int, match.groups())
+        if not 1 <= month <= 12 or year < 1:
             return False
+        return 1 <= day <= monthrange(year, month)[1]
@@ -1,21 +1,74 @@
 import os
 import time
-import pandas as pd
-import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 from .logger import logger
 from .config import Config
 from .webdriver_manager import WebDriverManager
+from .download_utils import setup_download_directory
+
+# Intervalo (em segundos) entre verificações das esperas explícitas do Selenium
+WAIT_POLL_INTERVAL = 0.1
+
+# Seletores CSS dos minicalendários (raiz de cada lado e elementos relativos a ela)
+CALENDAR_SELECTORS = {'left': '.calendar.left', 'right': '.calendar.right'}
+CALENDAR_HEADER_SELECTOR = "th[colspan='5']"
+
+# Dia disponível (td.available) com o número informado, filtrado no próprio navegador
+CALENDAR_DAY_XPATH = (
+    ".//td[contains(concat(' ', normalize-space(@class), ' '), ' available ')"
+    " and normalize-space(.)='{day}']"
+)
+
+# Número de cada mês pelo nome exibido no cabeçalho dos minicalendários
+MONTH_NUMBERS = {
+    'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4,
+    'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8,
+    'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12
+}
+
+# Clica N vezes na seta do minicalendário e retorna o novo cabeçalho do mês. O calendário
+# re-renderiza de forma síncrona a cada clique, então a seta é buscada de novo em cada volta
+CALENDAR_NAV_JS = """
+const [calendar, direction, clicks, headerSelector] = arguments;
+for (let i = 0; i < clicks; i++) {
+    const button = calendar.querySelector('th.' + direction);
+    if (!button) break;
+    button.click();
+}
+const header = calendar.querySelector(headerSelector);
+return header ? header.textContent.trim() : null;
+"""
+
+# Intervalo (em segundos) entre verificações do diretório durante o download do Excel
+EXCEL_POLL_INTERVAL = 0.25
+
+# Extensões dos arquivos temporários de download em andamento (Chrome e Firefox)
+PARTIAL_DOWNLOAD_SUFFIXES = ('.crdownload', '.part')
+
+# Planilhas geradas pela própria automação em segundo plano no diretório de downloads
+# (agendamentos convertidos do PDF e vendas), ignoradas ao procurar o Excel exportado
+GENERATED_EXCEL_SUFFIXES = ('-agendamentos.xlsx', '-vendas.xlsx')
+
+# Página de atendimentos (filtros e exportação de vacinas/exames)
+ATENDIMENTOS_URL = "https://app.simples.vet/consulta/atendimento/atendimento.php"
+
+# Subdiretório de downloads do navegador auxiliar (evita disputa de arquivos com o principal)
+SECONDARY_DOWNLOAD_SUBDIR = "paralelo"
 
-# Suprime warnings do pandas
-warnings.filterwarnings('ignore', category=pd.errors.SettingWithCopyWarning)
-warnings.filterwarnings('ignore', message='.*SettingWithCopyWarning.*')
 
 class ProcedureExtractor:
     """Extrator de atendimentos realizados (vacinas e exames) do SimplesVet"""
     def __init__(self, webdriver_manager: WebDriverManager, config: Config):
         self.webdriver_manager = webdriver_manager
         self.config = config
+        # Navegador auxiliar para extrair Exames em paralelo com Vacinas (criado sob demanda)
+        self._secondary_manager: Optional[WebDriverManager] = None
 
     def extract_procedures(self, start_date: str, end_date: str, month_str: str = None) -> dict:
         """
@@ -29,79 +82,175 @@ class ProcedureExtractor:
             'exames': None
         }
         
-        # Extrai primeiro Vacinas
-        logger.info("=" * 60)
-        logger.info("EXTRAINDO VACINAS")
-        logger.info("=" * 60)
-        results['vacinas'] = self._extract_by_event_type(
-            start_date, end_date, month_str, 
-            event_type='5', 
-            event_name='Vacina'
-        )
-        
-        # Aguarda um pouco entre as extrações
-        time.sleep(2)
+        secondary = self._get_secondary_manager()
+        if secondary is None:
+            # Sem navegador auxiliar: extrai em sequência no navegador principal
+            logger.info("=" * 60)
+            logger.info("EXTRAINDO VACINAS")
+            logger.info("=" * 60)
+            results['vacinas'] = self._extract_by_event_type(
+                start_date, end_date, month_str, 
+                event_type='5', 
+                event_name='Vacina'
+            )
+            
+            logger.info("=" * 60)
+            logger.info("EXTRAINDO EXAMES")
+            logger.info("=" * 60)
+            results['exames'] = self._extract_by_event_type(
+                start_date, end_date, month_str, 
+                event_type='7', 
+                event_name='Exames'
+            )
+            return results
         
-        # Extrai depois Exames
+        # Vacinas no navegador principal e Exames no auxiliar, ao mesmo tempo
         logger.info("=" * 60)
-        logger.info("EXTRAINDO EXAMES")
+        logger.info("EXTRAINDO VACINAS E EXAMES EM PARALELO")
         logger.info("=" * 60)
-        results['exames'] = self._extract_by_event_type(
-            start_date, end_date, month_str, 
-            event_type='7', 
-            event_name='Exames'
-        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                executor.submit(
+                    self._extract_by_event_type, start_date, end_date, month_str,
+                    event_type='5', event_name='Vacina'
+                ): 'vacinas',
+                executor.submit(
+                    self._extract_by_event_type, start_date, end_date, month_str,
+                    event_type='7', event_name='Exames',
+                    webdriver_manager=secondary, download_dir=secondary.download_dir,
+                    navigate=False
+                ): 'exames',
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao extrair {key}: {e}")
+        
+        # Só move o arquivo auxiliar depois que o principal terminou de aguardar o seu download
+        if results['exames']:
+            results['exames'] = self._move_to_download_dir(results['exames'])
         
         return results
+    
+    def _get_secondary_manager(self) -> Optional[WebDriverManager]:
+        """
+        Retorna o navegador auxiliar já autenticado, iniciando-o na primeira chamada
+        
+        Returns:
+            WebDriverManager auxiliar ou None se não for possível usá-lo
+        """
+        primary = self.webdriver_manager
+        # Só o Chrome tem o diretório de download configurável por instância
+        if not primary.driver or primary.browser_type != 'chrome':
+            return None
+        
+        if self._secondary_manager is None or not self._secondary_manager.driver:
+            download_dir = setup_download_directory(SECONDARY_DOWNLOAD_SUBDIR)
+            if not download_dir:
+                return None
+            
+            secondary = WebDriverManager(
+                browser_type=primary.browser_type,
+                headless=primary.headless,
+                wait_timeout=primary.wait_timeout,
+                download_dir=download_dir,
+                disable_images=primary.disable_images,
+                page_load_strategy=primary.page_load_strategy,
+                blocked_urls=primary.blocked_urls
+            )
+            if not secondary.start_browser():
+                # Uma falha depois de abrir o Chrome (ex: bloqueio de URLs) deixaria o driver aberto
+                secondary.close_browser()
+                logger.warning("Navegador auxiliar indisponível, extraindo em sequência")
+                return None
+            self._secondary_manager = secondary
+        
+        secondary = self._secondary_manager
+        # Recopia os cookies a cada mês para acompanhar a sessão do navegador principal; a cópia já
+        # deixa a página de atendimentos carregada e confere que ela abriu autenticada
+        if not secondary.copy_cookies_from(primary, ATENDIMENTOS_URL):
+            logger.warning("Navegador auxiliar não autenticado, extraindo em sequência")
+            return None
+        return secondary
+    
+    def _move_to_download_dir(self, file_path: str) -> str:
+        """Move um arquivo do diretório auxiliar para o diretório de downloads principal"""
+        download_dir = setup_download_directory()
+        if not download_dir:
+            return file_path
+        
+        try:
+            new_path = os.path.join(download_dir, os.path.basename(file_path))
+            os.replace(file_path, new_path)
+            return new_path
+        except OSError as e:
+            logger.warning(f"Não foi possível mover {file_path}: {e}")
+            return file_path
+    
+    def close(self):
+        """Fecha o navegador auxiliar, se tiver sido iniciado"""
+        if self._secondary_manager:
+            self._secondary_manager.close_browser()
+            self._secondary_manager = None
 
     def _extract_by_event_type(self, start_date: str, end_date: str, month_str: str, 
-                                event_type: str, event_name: str) -> str:
+                                event_type: str, event_name: str,
+                                webdriver_manager: Optional[WebDriverManager] = None,
+                                download_dir: Optional[str] = None, navigate: bool = True) -> str:
         """
         Extrai atendimentos de um tipo específico (Vacina ou Exames)
         event_type: '5' para Vacina, '7' para Exames
+        webdriver_manager/download_dir: navegador e pasta a usar (padrão: os principais)
+        navigate: False quando a página de atendimentos acabou de ser carregada (ex.: por copy_cookies_from)
         """
         logger.info(f"Iniciando extração de {event_name} de {start_date} até {end_date}")
-        driver = self.webdriver_manager.driver
+        manager = webdriver_manager or self.webdriver_manager
+        driver = manager.driver
         if not driver:
             logger.error("Driver não disponível")
             return None
 
         # Navega para página de atendimentos
-        atendimentos_url = "https://app.simples.vet/consulta/atendimento/atendimento.php"
-        self.webdriver_manager.navigate_to(atendimentos_url)
-        time.sleep(3)
+        if navigate:
+            manager.navigate_to(ATENDIMENTOS_URL)
 
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.support.ui import Select
-        
         try:
             # 1. Seleciona o tipo de evento (Vacina ou Exames)
             logger.info(f"Selecionando evento: {event_name}")
-            event_select = WebDriverWait(driver, 10).until(
+            event_select = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
                 EC.presence_of_element_located((By.ID, "p__tev_int_codigo"))
             )
             select = Select(event_select)
             select.select_by_value(event_type)
-            time.sleep(2)
 
-            # 2. Clica no campo de data
-            date_field = WebDriverWait(driver, 10).until(
+            # 2. Clica no campo de data (aguarda ficar clicável após a troca do evento)
+            date_field = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
                 EC.element_to_be_clickable((By.ID, "p__eve_dat_data_text"))
             )
             date_field.click()
-            time.sleep(1)
 
-            # 3. Seleciona "Selecionar período" no menu (se disponível)
+            # 3. Seleciona "Selecionar período" no menu (se disponível). Aguarda o que aparecer
+            # primeiro: o botão ou o calendário já aberto, sem gastar o timeout inteiro
             try:
-                periodo_btn = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, "//li[contains(text(),'Selecionar período')]"))
+                element = WebDriverWait(driver, 5, poll_frequency=WAIT_POLL_INTERVAL).until(
+                    EC.any_of(
+                        EC.element_to_be_clickable((By.XPATH, "//li[contains(text(),'Selecionar período')]")),
+                        EC.visibility_of_element_located((By.CSS_SELECTOR, CALENDAR_SELECTORS['left']))
+                    )
                 )
-                periodo_btn.click()
-                time.sleep(1)
-            except:
+                if element.tag_name.lower() == 'li':
+                    element.click()
+                else:
+                    logger.info("Botão 'Selecionar período' não encontrado, calendário já está aberto")
+            except WebDriverException:
                 logger.info("Botão 'Selecionar período' não encontrado, calendário já deve estar aberto")
+            
+            # Aguarda os minicalendários aparecerem
+            WebDriverWait(driver, 5, poll_frequency=WAIT_POLL_INTERVAL).until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, CALENDAR_SELECTORS['left']))
+            )
 
             # 4. Seleciona datas nos minicalendários
             def select_calendar_date(calendar_side, target_date):
@@ -110,81 +259,65 @@ class ProcedureExtractor:
                 calendar_side: 'left' ou 'right'
                 target_date: datetime.date
                 """
-                # Mapeamento de meses
-                month_map = {
-                    'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 
-                    'Maio': 5, 'Junho': 6, 'Julho': 7, 'Agosto': 8, 
-                    'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12
-                }
+                # Localiza o calendário uma única vez; cabeçalho, botões e dias são buscados
+                # a partir dele (o conteúdo é re-renderizado a cada troca de mês)
+                try:
+                    cal_root = driver.find_element(By.CSS_SELECTOR, CALENDAR_SELECTORS[calendar_side])
+                except Exception as e:
+                    logger.warning(f"Calendário '{calendar_side}' não encontrado: {e}")
+                    return False
+                
+                def read_month_header():
+                    return cal_root.find_element(By.CSS_SELECTOR, CALENDAR_HEADER_SELECTOR).text.strip()
+                
+                def parse_month_header(month_text):
+                    # Exemplo: 'Outubro 2025' -> (2025, 10); None se o formato for inesperado
+                    parts = month_text.split()
+                    if len(parts) != 2 or parts[0] not in MONTH_NUMBERS:
+                        logger.warning(f"Formato de mês inesperado: {month_text}")
+                        return None
+                    mes_nome, ano = parts
+                    return int(ano), MONTH_NUMBERS[mes_nome]
                 
-                # Navega até o mês/ano correto
+                # Navega até o mês/ano correto: lê o cabeçalho uma vez e calcula quantos cliques faltam
                 max_attempts = 24  # Evita loops infinitos
-                attempts = 0
-                while attempts < max_attempts:
-                    attempts += 1
-                    try:
-                        # Lê o mês/ano atual do calendário
-                        month_header = driver.find_element(
-                            By.CSS_SELECTOR, 
-                            f".calendar.{calendar_side} th[colspan='5']"
-                        )
-                        month_text = month_header.text.strip()
-                        
-                        # Exemplo: 'Outubro 2025'
-                        parts = month_text.split()
-                        if len(parts) != 2:
-                            logger.warning(f"Formato de mês inesperado: {month_text}")
-                            break
-                            
-                        mes_nome, ano = parts
-                        mes_atual = month_map.get(mes_nome, 0)
-                        ano_atual = int(ano)
+                try:
+                    month_text = read_month_header()
+                    current = parse_month_header(month_text)
+                    if current is not None:
+                        ano_atual, mes_atual = current
+                        delta = (target_date.year - ano_atual) * 12 + (target_date.month - mes_atual)
                         
-                        # Verifica se já estamos no mês/ano correto
-                        if mes_atual == target_date.month and ano_atual == target_date.year:
-                            break
+                        # Todos os cliques numa única chamada ao navegador, em vez de um por vez
+                        if delta:
+                            month_text = driver.execute_script(
+                                CALENDAR_NAV_JS, cal_root,
+                                'next' if delta > 0 else 'prev', min(abs(delta), max_attempts),
+                                CALENDAR_HEADER_SELECTOR
+                            ) or ''
                         
-                        # Navega para o mês correto
-                        if (ano_atual, mes_atual) < (target_date.year, target_date.month):
-                            # Próximo mês
-                            next_btn = driver.find_element(
-                                By.CSS_SELECTOR, 
-                                f".calendar.{calendar_side} th.next"
-                            )
-                            next_btn.click()
-                            time.sleep(0.5)
-                        else:
-                            # Mês anterior
-                            prev_btn = driver.find_element(
-                                By.CSS_SELECTOR, 
-                                f".calendar.{calendar_side} th.prev"
-                            )
-                            prev_btn.click()
-                            time.sleep(0.5)
-                    except Exception as e:
-                        logger.warning(f"Erro ao navegar calendário: {e}")
-                        break
+                        # Confere uma única vez se chegou no mês esperado
+                        if delta and parse_month_header(month_text) != (target_date.year, target_date.month):
+                            logger.warning(f"Calendário em '{month_text}', esperado {target_date:%m/%Y}")
+                except Exception as e:
+                    logger.warning(f"Erro ao navegar calendário: {e}")
                 
                 # Seleciona o dia
                 try:
-                    day_cells = driver.find_elements(
-                        By.CSS_SELECTOR, 
-                        f".calendar.{calendar_side} td.available"
+                    day_cells = cal_root.find_elements(
+                        By.XPATH, CALENDAR_DAY_XPATH.format(day=target_date.day)
                     )
-                    for cell in day_cells:
-                        if cell.text.strip() == str(target_date.day):
-                            cell.click()
-                            time.sleep(0.5)
-                            logger.info(f"Data selecionada: {target_date}")
-                            return True
+                    if day_cells:
+                        day_cells[0].click()
+                        logger.info(f"Data selecionada: {target_date}")
+                        return True
                 except Exception as e:
                     logger.error(f"Erro ao selecionar dia: {e}")
                 return False
 
             # Converte datas para datetime.date
-            from datetime import datetime as dt
-            start_dt = dt.strptime(start_date, "%Y-%m-%d").date()
-            end_dt = dt.strptime(end_date, "%Y-%m-%d").date()
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
 
             # Seleciona data inicial (calendário da esquerda)
             logger.info(f"Selecionando data inicial: {start_dt}")
@@ -193,8 +326,6 @@ class ProcedureExtractor:
             # Seleciona data final (calendário da direita)
             logger.info(f"Selecionando data final: {end_dt}")
             select_calendar_date('right', end_dt)
-            
-            time.sleep(1)
 
         except Exception as e:
             logger.error(f"Erro ao configurar filtros: {e}")
@@ -202,23 +333,25 @@ class ProcedureExtractor:
 
         # 5. Clica no botão de relatório
         try:
-            relatorio_btn = WebDriverWait(driver, 10).until(
+            relatorio_btn = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
                 EC.element_to_be_clickable((By.ID, "p__btn_relatorio"))
             )
             relatorio_btn.click()
             logger.info("Botão de relatório clicado")
-            time.sleep(1)
         except Exception as e:
             logger.error(f"Não foi possível clicar no botão de relatório: {e}")
             return None
 
-        # 6. Remove arquivos "atendimentos" antigos antes de baixar novos (agora em scrapper, precisa subir 3 níveis)
-        download_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "downloads")
+        # 6. Remove arquivos "atendimentos" antigos antes de baixar novos
+        download_dir = download_dir or setup_download_directory()
+        if not download_dir:
+            logger.error("Erro ao configurar diretório de download")
+            return None
         self._cleanup_old_atendimentos_files(download_dir)
         
         # 7. Clica em exportar para Excel
         try:
-            export_btn = WebDriverWait(driver, 10).until(
+            export_btn = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, "a.p__btn_exportar[rel='xls']"))
             )
             export_btn.click()
@@ -242,14 +375,14 @@ class ProcedureExtractor:
         """Remove arquivos 'atendimentos' antigos para evitar confusão"""
         try:
             if os.path.exists(download_dir):
-                for filename in os.listdir(download_dir):
-                    if 'atendimento' in filename.lower() and filename.endswith(('.xls', '.xlsx')):
-                        file_path = os.path.join(download_dir, filename)
-                        try:
-                            os.remove(file_path)
-                            logger.info(f"🗑️  Arquivo antigo removido: {filename}")
-                        except Exception as e:
-                            logger.warning(f"Não foi possível remover {filename}: {e}")
+                with os.scandir(download_dir) as entries:
+                    for entry in entries:
+                        if 'atendimento' in entry.name.lower() and entry.name.endswith(('.xls', '.xlsx')):
+                            try:
+                                os.remove(entry.path)
+                                logger.info(f"🗑️  Arquivo antigo removido: {entry.name}")
+                            except OSError as e:
+                                logger.warning(f"Não foi possível remover {entry.name}: {e}")
         except Exception as e:
             logger.warning(f"Erro ao limpar arquivos antigos: {e}")
 
@@ -257,38 +390,53 @@ class ProcedureExtractor:
         """Aguarda o download do arquivo Excel"""
         start_time = time.time()
         
-        # Registra os arquivos Excel que já existem com seus tamanhos
+        # Registra os arquivos Excel e temporários que já existem com seus mtimes. Temporários
+        # de downloads interrompidos nunca somem: só contam como download em andamento se
+        # forem novos ou mudarem depois deste ponto
         existing_files = {}
         if os.path.exists(download_dir):
-            for f in os.listdir(download_dir):
-                if f.endswith(('.xls', '.xlsx')):
-                    file_path = os.path.join(download_dir, f)
-                    existing_files[f] = os.path.getmtime(file_path)
-        
-        while time.time() - start_time < timeout:
-            time.sleep(2)
-            if os.path.exists(download_dir):
-                current_files = {}
-                for f in os.listdir(download_dir):
-                    if f.endswith(('.xls', '.xlsx')):
-                        file_path = os.path.join(download_dir, f)
-                        current_files[f] = os.path.getmtime(file_path)
-                
-                # Procura por arquivos novos ou modificados
-                for filename, mtime in current_files.items():
-                    # Arquivo novo ou modificado recentemente
-                    if filename not in existing_files or mtime > existing_files.get(filename, 0):
-                        file_path = os.path.join(download_dir, filename)
-                        
-                        # Verifica se o arquivo não está mais sendo escrito
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(('.xls', '.xlsx') + PARTIAL_DOWNLOAD_SUFFIXES):
                         try:
-                            initial_size = os.path.getsize(file_path)
-                            time.sleep(1)
-                            if os.path.getsize(file_path) == initial_size and initial_size > 0:
-                                return file_path
-                        except:
+                            existing_files[entry.name] = entry.stat(follow_symlinks=False).st_mtime_ns
+                        except FileNotFoundError:
                             continue
         
+        while time.time() - start_time < timeout:
+            time.sleep(EXCEL_POLL_INTERVAL)
+            if not os.path.exists(download_dir):
+                continue
+            
+            # Uma única varredura do diretório por ciclo: coleta os Excel novos ou
+            # modificados com seus tamanhos e verifica se há download em andamento
+            current_sizes = {}
+            downloading = False
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    is_partial = entry.name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)
+                    if not is_partial and (not entry.name.endswith(('.xls', '.xlsx'))
+                                           or entry.name.endswith(GENERATED_EXCEL_SUFFIXES)):
+                        continue
+                    # O navegador renomeia/remove arquivos durante a varredura
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    if st.st_mtime_ns <= existing_files.get(entry.name, -1):
+                        continue
+                    if is_partial:
+                        downloading = True
+                    else:
+                        current_sizes[entry.name] = st.st_size
+            
+            # O navegador grava no arquivo temporário e só renomeia para .xls/.xlsx ao
+            # terminar: sem temporário no diretório, o Excel novo já está completo
+            if not downloading:
+                for filename, size in current_sizes.items():
+                    if size > 0:
+                        return os.path.join(download_dir, filename)
+        
         # Como fallback, tenta pegar o arquivo mais recente que contém "atendimento" no nome
         if os.path.exists(download_dir):
             excel_files = [f for f in os.listdir(download_dir) 
@@ -324,10 +472,8 @@ class ProcedureExtractor:
             
             new_path = os.path.join(dir_path, new_name)
             
-            # Renomeia o arquivo
-            if os.path.exists(new_path):
-                os.remove(new_path)
-            os.rename(excel_path, new_path)
+            # Renomeia o arquivo (os.replace sobrescreve o destino de forma atômica)
+            os.replace(excel_path, new_path)
             
             logger.info(f"✅ Excel de {event_name} criado: {new_path}")
             return new_path
@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from datetime import datetime
 from .config import Config
 from .logger import logger
@@ -51,6 +52,66 @@ class SimplesVetScraper:
         
         return True
     
+    def _process_month(self, month_str: str, appointments_future: Future):
+        """
+        Processa um mês: extrai vendas e procedimentos e resume os agendamentos baixados em lote
+        
+        Args:
+            month_str: Mês no formato YYYYMM
+            appointments_future: Download em lote dos agendamentos (em andamento em segundo plano)
+        """
+        try:
+            # Converte mês em range de datas
+            start_date, end_date = self.config.get_date_range_from_month(month_str)
+            print(f"\n📋 Processando mês {month_str} ({start_date} até {end_date})...")
+            
+            # Extrai dados de vendas para o mês (a planilha é gravada enquanto seguem os procedimentos)
+            print(f"\n💰 Processando vendas de {month_str}...")
+            vendas_future = self.simplesvet.get_vendas_data(
+                start_date, end_date, month_str
+            )
+            
+            # Extrai dados de procedimentos (vacinas e exames) para o mês
+            print(f"\n💉 Processando procedimentos de {month_str}...")
+            procedures = self.simplesvet.get_procedures_data(
+                start_date, end_date, month_str
+            )
+            
+            if procedures:
+                if procedures.get('vacinas'):
+                    print(f"✅ Vacinas extraídas: {procedures['vacinas']}")
+                else:
+                    print(f"⚠️  Nenhuma vacina encontrada para {month_str}")
+                
+                if procedures.get('exames'):
+                    print(f"✅ Exames extraídos: {procedures['exames']}")
+                else:
+                    print(f"⚠️  Nenhum exame encontrado para {month_str}")
+            else:
+                print(f"⚠️  Nenhum procedimento encontrado para {month_str}")
+            
+            # Só reporta as vendas depois que a planilha foi de fato gravada
+            vendas_file = vendas_future.result()
+            if vendas_file:
+                print(f"✅ Vendas extraídas e salvas em: {vendas_file}")
+                logger.info(f"Vendas extraídas para {month_str}: {vendas_file}")
+            else:
+                print(f"⚠️  Nenhuma venda salva para {month_str}")
+            
+            # Resume os agendamentos do mês. Aguarda o download em lote (que correu junto com vendas e procedimentos)
+            appointments = appointments_future.result().get(month_str, [])
+            if appointments:
+                # Calcula o total de agendamentos extraídos
+                total_appointments = sum(item.get('appointments_count', 0) for item in appointments)
+                print(f"✅ {total_appointments} agendamentos extraídos para {month_str}!")
+                logger.info(f"Dados extraídos para {month_str}: {total_appointments} agendamentos em {len(appointments)} arquivo(s)")
+            else:
+                print(f"⚠️  Nenhum atendimento encontrado para {month_str}")
+        
+        except Exception as e:
+            logger.error(f"Erro ao processar mês {month_str}: {e}")
+            print(f"❌ Erro ao processar mês {month_str}: {e}")
+    
     def run(self) -> bool:
         """
         Executa o processo completo de scraping
@@ -75,92 +136,49 @@ class SimplesVetScraper:
             
             print("\n🚀 Iniciando automação...")
             
-            # Inicializa as ações do SimplesVet
+            # Inicializa as ações do SimplesVet. O with fecha o navegador principal e o
+            # auxiliar em qualquer saída (retorno antecipado, erro ou interrupção)
             self.simplesvet = SimplesVetActions(self.config)
             
             try:
-                # Inicia o navegador
-                logger.info("Iniciando navegador...")
-                if not self.simplesvet.start_browser():
-                    logger.error("❌ Falha ao iniciar o navegador")
-                    return False
-                
-                print("✅ Navegador iniciado com sucesso")
-                
-                # Realiza login
-                print("🔐 Realizando login...")
-                if not self.simplesvet.login():
-                    logger.error("❌ Falha no login")
-                    print("❌ Falha no login. Verifique suas credenciais.")
-                    return False
-                
-                print("✅ Login realizado com sucesso!")
-                
-                # Obtém lista de meses configurados
-                months = self.config.get_months()
-                
-                # Processa cada mês individualmente
-                for month_str in months:
-                    try:
-                        # Converte mês em range de datas
-                        start_date, end_date = self.config.get_date_range_from_month(month_str)
-                        
-                        # Extrai dados de atendimentos para o mês
-                        print(f"\n📋 Processando mês {month_str} ({start_date} até {end_date})...")
-                        appointments = self.simplesvet.get_appointments_data(
-                            start_date, end_date, month_str
-                        )
-                        
-                        if appointments:
-                            # Calcula o total de agendamentos extraídos
-                            total_appointments = sum(item.get('appointments_count', 0) for item in appointments)
-                            print(f"✅ {total_appointments} agendamentos extraídos para {month_str}!")
-                            logger.info(f"Dados extraídos para {month_str}: {total_appointments} agendamentos em {len(appointments)} arquivo(s)")
-                        else:
-                            print(f"⚠️  Nenhum atendimento encontrado para {month_str}")
-                        
-                        # Extrai dados de vendas para o mês
-                        print(f"\n💰 Processando vendas de {month_str}...")
-                        vendas = self.simplesvet.get_vendas_data(
-                            start_date, end_date, month_str
-                        )
-                        
-                        if vendas:
-                            print(f"✅ Vendas extraídas e salvas em: {vendas[0]}")
-                            logger.info(f"Vendas extraídas para {month_str}: {vendas[0]}")
-                        else:
-                            print(f"⚠️  Nenhuma venda encontrada para {month_str}")
-                        
-                        # Extrai dados de procedimentos (vacinas e exames) para o mês
-                        print(f"\n💉 Processando procedimentos de {month_str}...")
-                        procedures = self.simplesvet.get_procedures_data(
-                            start_date, end_date, month_str
-                        )
-                        
-                        if procedures:
-                            if procedures.get('vacinas'):
-                                print(f"✅ Vacinas extraídas: {procedures['vacinas']}")
-                            else:
-                                print(f"⚠️  Nenhuma vacina encontrada para {month_str}")
-                            
-                            if procedures.get('exames'):
-                                print(f"✅ Exames extraídos: {procedures['exames']}")
-                            else:
-                                print(f"⚠️  Nenhum exame encontrado para {month_str}")
-                        else:
-                            print(f"⚠️  Nenhum procedimento encontrado para {month_str}")
+                with self.simplesvet:
+                    # Inicia o navegador
+                    logger.info("Iniciando navegador...")
+                    if not self.simplesvet.start_browser():
+                        logger.error("❌ Falha ao iniciar o navegador")
+                        return False
+                    
+                    print("✅ Navegador iniciado com sucesso")
+                    
+                    # Realiza login
+                    print("🔐 Realizando login...")
+                    if not self.simplesvet.login():
+                        logger.error("❌ Falha no login")
+                        print("❌ Falha no login. Verifique suas credenciais.")
+                        return False
+                    
+                    print("✅ Login realizado com sucesso!")
+                    
+                    # Obtém lista de meses configurados
+                    months = self.config.get_months()
+                    
+                    # Baixa os relatórios de agendamentos de todos os meses em paralelo,
+                    # em segundo plano, enquanto o navegador extrai vendas e procedimentos
+                    periods = [
+                        (*self.config.get_date_range_from_month(month_str), month_str)
+                        for month_str in months
+                    ]
+                    print(f"\n📋 Baixando agendamentos de {len(periods)} mês(es)...")
+                    appointments_future = self.simplesvet.start_appointments_batch(periods)
+                    
+                    # Processa cada mês individualmente
+                    for month_str in months:
+                        self._process_month(month_str, appointments_future)
+                    
+                    # Não realiza logout, apenas fecha o navegador no final
                     
-                    except Exception as e:
-                        logger.error(f"Erro ao processar mês {month_str}: {e}")
-                        print(f"❌ Erro ao processar mês {month_str}: {e}")
-                
-                # Não realiza logout, apenas fecha o navegador no final
-                
             finally:
-                # Fecha o navegador
-                if self.simplesvet:
-                    self.simplesvet.close_browser()
-                    print("🔒 Navegador fechado")
+                print("🔒 Navegador fechado")
             
             print("\n✅ Automação concluída com sucesso!")
             return True
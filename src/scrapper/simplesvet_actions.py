@@ -1,12 +1,88 @@
-import time
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import Optional, List, Tuple, Dict
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from .config import Config
-from .webdriver_manager import WebDriverManager
+from .webdriver_manager import WebDriverManager, LOGIN_RE
 from .appointment_extractor import AppointmentExtractor
 from .venda_extractor import VendaExtractor
 from .procedure_extractor import ProcedureExtractor
 from .logger import logger
 
+# Seletores do campo de email na tela de login (em ordem de preferência)
+EMAIL_SELECTORS = (
+    'input[name="l_usu_var_email"]',
+    '#l_usu_var_email',
+    'input[type="email"]',
+)
+
+# Seletores do campo de senha na tela de login
+PASSWORD_SELECTORS = (
+    'input[name="l_usu_var_senha"]',
+    '#l_usu_var_senha',
+    'input[type="password"]',
+)
+
+# Seletores do botão de login
+LOGIN_BUTTON_SELECTORS = (
+    '#btn_login',
+    'button[type="submit"]',
+    'input[type="submit"]',
+    '.btn-login',
+)
+
+# Preenche o formulário de login e clica no botão numa única chamada ao navegador. Dispara
+# 'input'/'change' para as validações da página; retorna false se faltar algum elemento
+LOGIN_FORM_JS = """
+const [emailSelectors, passwordSelectors, buttonSelectors, email, password] = arguments;
+const first = selectors => {
+    for (const selector of selectors) {
+        const element = document.querySelector(selector);
+        if (element) return element;
+    }
+    return null;
+};
+const emailField = first(emailSelectors);
+const passwordField = first(passwordSelectors);
+const button = first(buttonSelectors);
+if (!emailField || !passwordField || !button) return false;
+for (const [field, value] of [[emailField, email], [passwordField, password]]) {
+    field.value = value;
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+}
+button.click();
+return true;
+"""
+
+# Elementos que indicam sucesso no login
+LOGIN_SUCCESS_SELECTORS = (
+    '.dashboard',
+    '#dashboard',
+    '.main-content',
+    '.user-menu',
+    '[data-testid="dashboard"]',
+    '.sidebar',
+)
+
+# Seletores para encontrar o menu/link de atendimentos
+APPOINTMENTS_LINK_SELECTORS = (
+    'a[href*="atendimento"]',
+    'a[href*="consulta"]',
+    'a[href*="appointment"]',
+    '.menu-atendimentos',
+    '#menu-atendimentos',
+)
+
+
+def _completed_future(result) -> Future:
+    """Future já resolvido, para os casos em que não há trabalho em segundo plano"""
+    future = Future()
+    future.set_result(result)
+    return future
+
 
 class SimplesVetActions:
     def __init__(self, config: Config):
@@ -17,26 +93,37 @@ class SimplesVetActions:
             config: Instância de configuração
         """
         self.config = config
-        self.webdriver_manager: Optional[WebDriverManager] = None
-        self.appointment_extractor: Optional[AppointmentExtractor] = None
-        self.venda_extractor: Optional[VendaExtractor] = None
-        self.procedure_extractor: Optional[ProcedureExtractor] = None
         self.is_logged_in = False
-        
-        # Inicializa o WebDriver com configurações do config.json
+    
+    # WebDriver e extratores são criados sob demanda, no primeiro uso
+    @cached_property
+    def webdriver_manager(self) -> WebDriverManager:
+        """Gerenciador do WebDriver com as configurações do config.json"""
         browser_config = self.config.get_browser_config()
-        self.webdriver_manager = WebDriverManager(
+        return WebDriverManager(
             browser_type=browser_config.get('type', 'chrome'),
             headless=browser_config.get('headless', False),
-            wait_timeout=browser_config.get('wait_timeout', 10)
+            wait_timeout=browser_config.get('wait_timeout', 10),
+            disable_images=browser_config.get('disable_images', True),
+            user_data_dir=browser_config.get('user_data_dir'),
+            page_load_strategy=browser_config.get('page_load_strategy', 'eager'),
+            blocked_urls=browser_config.get('blocked_urls')
         )
-        
-        # Inicializa AppointmentExtractor
-        self.appointment_extractor = AppointmentExtractor(self.webdriver_manager, self.config)
-        # Inicializa VendaExtractor
-        self.venda_extractor = VendaExtractor(self.webdriver_manager, self.config)
-        # Inicializa ProcedureExtractor
-        self.procedure_extractor = ProcedureExtractor(self.webdriver_manager, self.config)
+    
+    @cached_property
+    def appointment_extractor(self) -> AppointmentExtractor:
+        """Extrator de agendamentos"""
+        return AppointmentExtractor(self.webdriver_manager, self.config)
+    
+    @cached_property
+    def venda_extractor(self) -> VendaExtractor:
+        """Extrator de vendas"""
+        return VendaExtractor(self.webdriver_manager, self.config)
+    
+    @cached_property
+    def procedure_extractor(self) -> ProcedureExtractor:
+        """Extrator de procedimentos (vacinas e exames)"""
+        return ProcedureExtractor(self.webdriver_manager, self.config)
     
     def start_browser(self) -> bool:
         """
@@ -45,17 +132,26 @@ class SimplesVetActions:
         Returns:
             True se o navegador foi iniciado com sucesso
         """
-        if not self.webdriver_manager:
-            logger.error("WebDriver Manager não foi inicializado")
-            return False
-        
         return self.webdriver_manager.start_browser()
     
     def close_browser(self):
         """Fecha o navegador"""
-        if self.webdriver_manager:
+        # Só fecha o que chegou a ser criado (acessar a propriedade criaria a instância)
+        if 'procedure_extractor' in self.__dict__:
+            self.procedure_extractor.close()
+        if 'venda_extractor' in self.__dict__:
+            self.venda_extractor.close()
+        if 'webdriver_manager' in self.__dict__:
             self.webdriver_manager.close_browser()
-            self.is_logged_in = False
+        self.is_logged_in = False
+    
+    def __enter__(self) -> 'SimplesVetActions':
+        """Permite usar as ações com 'with' (os navegadores são fechados ao sair do bloco)"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Fecha os navegadores ao sair do bloco 'with'"""
+        self.close_browser()
     
     def _find_element_by_selectors(self, selectors: list, timeout: Optional[int] = None):
         """
@@ -68,9 +164,6 @@ class SimplesVetActions:
         Returns:
             Elemento encontrado ou None
         """
-        if not self.webdriver_manager:
-            return None
-        
         return self.webdriver_manager.find_element_by_selectors(selectors, timeout)
     
     def login(self) -> bool:
@@ -94,9 +187,15 @@ class SimplesVetActions:
             if not self.webdriver_manager.navigate_to(login_url):
                 return False
             
-            time.sleep(1)
+            # Com perfil persistente, o SimplesVet redireciona para fora do login se a sessão ainda vale
+            if self.webdriver_manager.user_data_dir:
+                current_url = self.webdriver_manager.get_current_url()
+                if current_url and not LOGIN_RE.search(current_url):
+                    logger.info("Sessão anterior ainda válida, login dispensado")
+                    self.is_logged_in = True
+                    return True
             
-            # Obtém credenciais
+            # Obtém credenciais (_find_element_by_selectors já aguarda o formulário carregar)
             email = self.config.get_credential('simplesvet', 'email')
             password = self.config.get_credential('simplesvet', 'password')
             
@@ -104,57 +203,44 @@ class SimplesVetActions:
                 logger.error("Credenciais não configuradas")
                 return False
             
-            email_selectors = [
-                'input[name="l_usu_var_email"]',
-                'input[id="l_usu_var_email"]',
-                '#l_usu_var_email',
-                'input[type="email"]'
-            ]
-            
-            password_selectors = [
-                'input[name="l_usu_var_senha"]',
-                'input[id="l_usu_var_senha"]',
-                '#l_usu_var_senha',
-                'input[type="password"]'
-            ]
-            
-            login_button_selectors = [
-                'button[id="btn_login"]',
-                '#btn_login',
-                'button[type="submit"]',
-                'input[type="submit"]',
-                '.btn-login'
-            ]
-            
-            email_field = self._find_element_by_selectors(email_selectors)
+            email_field = self._find_element_by_selectors(EMAIL_SELECTORS)
             if not email_field:
                 logger.error("Campo de email não encontrado")
                 return False
             
-            email_field.clear()
-            email_field.send_keys(email)
-            logger.info("Email preenchido")
+            driver = self.webdriver_manager.driver
+            wait = WebDriverWait(driver, self.webdriver_manager.wait_timeout)
+            # Formulários com validação por tecla exigem eventos de teclado reais
+            keystroke_login = self.config.get_browser_config().get('keystroke_login', False)
             
-            password_field = self._find_element_by_selectors(password_selectors)
-            if not password_field:
-                logger.error("Campo de senha não encontrado")
-                return False
-            
-            password_field.clear()
-            password_field.send_keys(password)
-            logger.info("Senha preenchida")
-            
-            time.sleep(1)
-            
-            login_button = self._find_element_by_selectors(login_button_selectors)
-            if not login_button:
-                logger.error("Botão de login não encontrado")
-                return False
-            
-            login_button.click()
-            logger.info("Botão de login clicado")
+            if not keystroke_login and self._submit_login_form(email, password):
+                logger.info("Formulário de login preenchido e enviado")
+            else:
+                # Caminho campo a campo, caso o script não consiga enviar o formulário inteiro
+                self._fill_field(email_field, email, keystroke_login)
+                logger.info("Email preenchido")
+                
+                password_field = self._find_element_by_selectors(PASSWORD_SELECTORS)
+                if not password_field:
+                    logger.error("Campo de senha não encontrado")
+                    return False
+                
+                self._fill_field(password_field, password, keystroke_login)
+                logger.info("Senha preenchida")
+                
+                login_button = self._find_element_by_selectors(LOGIN_BUTTON_SELECTORS)
+                if not login_button:
+                    logger.error("Botão de login não encontrado")
+                    return False
+                
+                wait.until(EC.element_to_be_clickable(login_button)).click()
+                logger.info("Botão de login clicado")
             
-            time.sleep(1)
+            # Aguarda sair da página de login; se não sair, _verify_login confere os outros sinais
+            try:
+                wait.until(lambda d: not LOGIN_RE.search(d.current_url))
+            except TimeoutException:
+                logger.debug("URL ainda na página de login após o clique")
             
             if self._verify_login():
                 logger.info("Login realizado com sucesso!")
@@ -168,6 +254,38 @@ class SimplesVetActions:
             logger.error(f"Erro durante o login: {e}")
             return False
     
+    def _submit_login_form(self, email: str, password: str) -> bool:
+        """
+        Preenche email e senha e clica no botão de login com um único comando ao navegador
+        
+        Args:
+            email: Email de acesso
+            password: Senha de acesso
+            
+        Returns:
+            True se o formulário foi preenchido e enviado
+        """
+        try:
+            return bool(self.webdriver_manager.driver.execute_script(
+                LOGIN_FORM_JS, EMAIL_SELECTORS, PASSWORD_SELECTORS, LOGIN_BUTTON_SELECTORS, email, password
+            ))
+        except Exception as e:
+            logger.debug("Envio do login via script falhou: %s", e)
+            return False
+    
+    def _fill_field(self, field, value: str, keystroke: bool):
+        """
+        Preenche um campo do formulário
+        
+        Args:
+            field: Campo de entrada
+            value: Valor a preencher
+            keystroke: Se True, digita tecla a tecla (clear() + send_keys())
+        """
+        if keystroke or not self.webdriver_manager.set_input_value(field, value):
+            field.clear()
+            field.send_keys(value)
+    
     def _verify_login(self) -> bool:
         """
         Verifica se o login foi realizado com sucesso
@@ -176,33 +294,23 @@ class SimplesVetActions:
             True se o usuário está logado
         """
         try:
+            # Verificações baratas primeiro (um comando cada); a busca por elementos, que pode
+            # esperar até 3s, fica por último
             current_url = self.webdriver_manager.get_current_url()
-            page_title = self.webdriver_manager.get_page_title()
             
             # Verifica se não está mais na página de login
-            if current_url and 'login' not in current_url.lower():
-                logger.debug(f"URL atual: {current_url}")
-                return True
-            
-            # Verifica elementos que indicam sucesso no login
-            success_selectors = [
-                '.dashboard',
-                '#dashboard',
-                '.main-content',
-                '.user-menu',
-                '[data-testid="dashboard"]',
-                '.sidebar'
-            ]
-            
-            success_element = self._find_element_by_selectors(success_selectors, timeout=3)
-            if success_element:
+            if current_url and not LOGIN_RE.search(current_url):
+                logger.debug("URL atual: %s", current_url)
                 return True
             
             # Verifica título da página
-            if page_title and 'login' not in page_title.lower():
+            page_title = self.webdriver_manager.get_page_title()
+            if page_title and not LOGIN_RE.search(page_title):
                 return True
             
-            return False
+            # Verifica elementos que indicam sucesso no login
+            success_element = self._find_element_by_selectors(LOGIN_SUCCESS_SELECTORS, timeout=3)
+            return bool(success_element)
             
         except Exception as e:
             logger.error(f"Erro ao verificar login: {e}")
@@ -229,13 +337,9 @@ class SimplesVetActions:
             logger.info(f"Buscando atendamentos de {start_date} até {end_date}")
             
             # Usa o AppointmentExtractor para extrair os agendamentos
-            if self.appointment_extractor:
-                appointments = self.appointment_extractor.extract_appointments(
-                    start_date, end_date, month_str
-                )
-            else:
-                logger.error("AppointmentExtractor não foi inicializado")
-                appointments = []
+            appointments = self.appointment_extractor.extract_appointments(
+                start_date, end_date, month_str
+            )
             
             # Calcula o total de agendamentos extraídos
             total_appointments = sum(item.get('appointments_count', 0) for item in appointments)
@@ -246,40 +350,84 @@ class SimplesVetActions:
             logger.error(f"Erro ao extrair dados de atendimentos: {e}")
             return []
     
-    def get_vendas_data(self, start_date: str = None, end_date: str = None, month_str: str = None) -> list:
+    def get_appointments_data_batch(self, periods: List[Tuple[str, str, str]],
+                                    request_args: Optional[Dict] = None) -> Dict[str, list]:
+        """
+        Extrai dados de atendimentos de vários meses, com downloads em paralelo
+        
+        Args:
+            periods: Lista de tuplas (data_inicio, data_fim, mes) no formato (YYYY-MM-DD, YYYY-MM-DD, YYYYMM)
+            request_args: Cookies e headers de AppointmentExtractor.prepare_session()
+            
+        Returns:
+            Dicionário {mes: lista com dados dos atendimentos}
+        """
+        try:
+            if not self.is_logged_in:
+                logger.error("Usuário não está logado")
+                return {}
+            
+            logger.info(f"Buscando atendimentos de {len(periods)} mês(es)")
+            return self.appointment_extractor.extract_appointments_batch(periods, request_args)
+            
+        except Exception as e:
+            logger.error(f"Erro ao extrair dados de atendimentos: {e}")
+            return {}
+    
+    def start_appointments_batch(self, periods: List[Tuple[str, str, str]]) -> Future:
+        """
+        Inicia get_appointments_data_batch em segundo plano
+        
+        Os relatórios de agendamentos são baixados via HTTP e convertidos em processos separados,
+        então o navegador fica livre para vendas e procedimentos enquanto isso
+        
+        Args:
+            periods: Lista de tuplas (data_inicio, data_fim, mes) no formato (YYYY-MM-DD, YYYY-MM-DD, YYYYMM)
+            
+        Returns:
+            Future com o dicionário {mes: lista com dados dos atendimentos}
+        """
+        # Os cookies são lidos aqui, na thread que controla o driver (o Selenium não é thread-safe)
+        request_args = self.appointment_extractor.prepare_session()
+        if not request_args:
+            return _completed_future({})
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self.get_appointments_data_batch, periods, request_args)
+        executor.shutdown(wait=False)
+        return future
+    
+    def get_vendas_data(self, start_date: str = None, end_date: str = None, month_str: str = None) -> Future:
         """
         Extrai dados de vendas do SimplesVet
         
+        A planilha é gravada em segundo plano, então o navegador já pode seguir para os procedimentos
+        
         Args:
             start_date: Data de início (formato YYYY-MM-DD)
             end_date: Data de fim (formato YYYY-MM-DD)
             month_str: Mês no formato YYYYMM (usado para nome do arquivo)
             
         Returns:
-            Lista com caminho do arquivo Excel gerado
+            Future com o caminho do arquivo Excel gerado (None se a extração ou a gravação falhar)
         """
         try:
             if not self.is_logged_in:
                 logger.error("Usuário não está logado")
-                return []
+                return _completed_future(None)
             
             logger.info(f"Buscando vendas de {start_date} até {end_date}")
             
-            if self.venda_extractor:
-                excel_file = self.venda_extractor.extract_vendas(start_date, end_date, month_str)
-                if excel_file:
-                    logger.info(f"Vendas extraídas e salvas em: {excel_file}")
-                    return [excel_file]
-                else:
-                    logger.warning("Nenhuma venda extraída")
-                    return []
+            write = self.venda_extractor.extract_vendas(start_date, end_date, month_str)
+            if write:
+                return write
             else:
-                logger.error("VendaExtractor não foi inicializado")
-                return []
+                logger.warning("Nenhuma venda extraída")
+                return _completed_future(None)
             
         except Exception as e:
             logger.error(f"Erro ao extrair dados de vendas: {e}")
-            return []
+            return _completed_future(None)
     
     def get_procedures_data(self, start_date: str = None, end_date: str = None, month_str: str = None) -> dict:
         """
@@ -300,19 +448,15 @@ class SimplesVetActions:
             
             logger.info(f"Buscando procedimentos de {start_date} até {end_date}")
             
-            if self.procedure_extractor:
-                results = self.procedure_extractor.extract_procedures(start_date, end_date, month_str)
-                if results:
-                    if results.get('vacinas'):
-                        logger.info(f"Vacinas extraídas: {results['vacinas']}")
-                    if results.get('exames'):
-                        logger.info(f"Exames extraídos: {results['exames']}")
-                    return results
-                else:
-                    logger.warning("Nenhum procedimento extraído")
-                    return {'vacinas': None, 'exames': None}
+            results = self.procedure_extractor.extract_procedures(start_date, end_date, month_str)
+            if results:
+                if results.get('vacinas'):
+                    logger.info(f"Vacinas extraídas: {results['vacinas']}")
+                if results.get('exames'):
+                    logger.info(f"Exames extraídos: {results['exames']}")
+                return results
             else:
-                logger.error("ProcedureExtractor não foi inicializado")
+                logger.warning("Nenhum procedimento extraído")
                 return {'vacinas': None, 'exames': None}
             
         except Exception as e:
@@ -331,19 +475,17 @@ class SimplesVetActions:
                 logger.error("Usuário não está logado")
                 return False
             
-            # Seletores para encontrar o menu/link de atendimentos
-            appointments_selectors = [
-                'a[href*="atendimento"]',
-                'a[href*="consulta"]',
-                'a[href*="appointment"]',
-                '.menu-atendimentos',
-                '#menu-atendimentos'
-            ]
-            
-            appointments_link = self._find_element_by_selectors(appointments_selectors)
+            # Procura o menu/link de atendimentos
+            appointments_link = self._find_element_by_selectors(APPOINTMENTS_LINK_SELECTORS)
             if appointments_link:
+                previous_url = self.webdriver_manager.get_current_url()
                 appointments_link.click()
-                time.sleep(3)
+                try:
+                    WebDriverWait(self.webdriver_manager.driver, self.webdriver_manager.wait_timeout).until(
+                        EC.url_changes(previous_url)
+                    )
+                except TimeoutException:
+                    logger.warning("URL não mudou após clicar no link de atendimentos")
                 logger.info("Navegado para página de atendimentos")
                 return True
             else:
@@ -1,26 +1,140 @@
 import os
+import re
 import time
 import pandas as pd
-import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from .logger import logger
 from .config import Config
 from .webdriver_manager import WebDriverManager
+from .download_utils import setup_download_directory
+from .procedure_extractor import (
+    MONTH_NUMBERS, CALENDAR_SELECTORS, CALENDAR_HEADER_SELECTOR, WAIT_POLL_INTERVAL,
+    PARTIAL_DOWNLOAD_SUFFIXES
+)
 
-# Suprime warnings do pandas
-warnings.filterwarnings('ignore', category=pd.errors.SettingWithCopyWarning)
-warnings.filterwarnings('ignore', message='.*SettingWithCopyWarning.*')
+try:
+    import pyarrow  # opcional, leitor de CSV multi-thread para o pandas
+except ImportError:
+    pyarrow = None
+
+try:
+    import xlsxwriter  # opcional, gravação de .xlsx mais rápida que o openpyxl
+except ImportError:
+    xlsxwriter = None
+
+# Tempo máximo (em segundos) para o download do CSV começar após o clique em exportar
+DOWNLOAD_START_TIMEOUT = 10
+
+# Intervalo (em segundos) entre verificações do início do download
+DOWNLOAD_START_POLL_INTERVAL = 0.1
+
+# Intervalo (em segundos) entre verificações do diretório durante o download do CSV
+CSV_POLL_INTERVAL = 0.25
+
+# Motor de leitura do CSV de vendas (pyarrow quando instalado)
+CSV_ENGINE = 'pyarrow' if pyarrow is not None else 'c'
+
+# Motor de gravação da planilha de vendas (xlsxwriter quando instalado)
+EXCEL_ENGINE = 'xlsxwriter' if xlsxwriter is not None else 'openpyxl'
+
+# Colunas mantidas na planilha de vendas, na ordem em que são gravadas
+VENDAS_COLUMNS = (
+    'Data e hora', 'Venda', 'Status da venda', 'Funcionário', 'Cliente', 'Animal',
+    'Tipo do Item', 'Grupo', 'Produto/serviço', 'Valor Unitário', 'Quantidade', 'Bruto', 'Desconto', 'Líquido'
+)
+
+# Colunas financeiras e quantidade (lidas como texto e convertidas do formato brasileiro)
+NUMERIC_COLUMNS = ('Valor Unitário', 'Quantidade', 'Bruto', 'Desconto', 'Líquido')
+
+# Opções extras de leitura do CSV. No motor C, o arquivo é mapeado em memória, as colunas
+# não usadas são descartadas e os números no formato brasileiro ('1.500,25') já são convertidos
+# na tokenização. O pyarrow não aceita essas opções: lá as colunas numéricas são lidas como
+# texto ('1.500' não pode virar 1.5) e convertidas depois
+CSV_READ_OPTIONS = {
+    'memory_map': True,
+    'low_memory': False,
+    'usecols': frozenset(VENDAS_COLUMNS).__contains__,
+    'thousands': '.',
+    'decimal': ',',
+} if CSV_ENGINE == 'c' else {'dtype': {col: str for col in NUMERIC_COLUMNS}}
+
+# Caracteres descartados dos valores numéricos (tudo que não é dígito, vírgula decimal ou sinal)
+NON_NUMERIC_RE = re.compile(r'[^0-9,-]')
+
+# Bytes do início do CSV usados para detectar a codificação antes da leitura
+ENCODING_SNIFF_BYTES = 64 * 1024
+
+# Trecho da mensagem com que o pyarrow acusa UTF-8 inválido (ArrowInvalid, um ValueError)
+PYARROW_INVALID_UTF8 = 'invalid utf8'
+
+# Página de vendas (filtros e exportação do relatório)
+VENDAS_URL = "https://app.simples.vet/principal/venda/venda.php"
+
+# Localizadores dos elementos da página de vendas, já no formato (By, seletor)
+LOCATORS = {
+    'date_field': (By.ID, "p__ven_dat_data_text"),
+    'period_li': (By.XPATH, "//li[contains(text(),'Selecionar período')]"),
+    'calendar_header': (By.CSS_SELECTOR, f"{CALENDAR_SELECTORS['left']} {CALENDAR_HEADER_SELECTOR}"),
+    'relatorio_btn': (By.ID, "p__btn_relatorio"),
+    'export_btn': (By.CSS_SELECTOR, "a.p__btn_exportar[rel='xls_vendas']"),
+}
+
+# Nomes dos meses na ordem do calendário (o índice é o mês - 1), enviados ao script de seleção
+MONTH_NAMES = tuple(MONTH_NUMBERS)
+
+# Limite de cliques nas setas do minicalendário (evita loops infinitos)
+CALENDAR_MAX_CLICKS = 24
+
+# Navega o minicalendário até o mês/ano alvo numa única chamada ao navegador e retorna a célula do dia.
+# O dia não é clicado aqui: o daterangepicker seleciona no mousedown, que um click() sintético não dispara.
+# Retorna null se não chegar no mês ou não achar o dia (o Python refaz os passos e reporta o erro)
+CALENDAR_SELECT_JS = """
+const [calendarSelector, headerSelector, monthNames, year, month, day, maxClicks] = arguments;
+const calendar = document.querySelector(calendarSelector);
+if (!calendar) return null;
+const current = () => {
+    const header = calendar.querySelector(headerSelector);
+    const [name, ano] = header ? header.textContent.trim().split(/\\s+/) : [];
+    const index = monthNames.indexOf(name);
+    return index < 0 ? NaN : Number(ano) * 12 + index;
+};
+if (Number.isNaN(current())) return null;
+const target = year * 12 + (month - 1);
+for (let i = 0; i < maxClicks && current() !== target; i++) {
+    const button = calendar.querySelector(current() < target ? 'th.next' : 'th.prev');
+    if (!button) break;
+    button.click();
+}
+if (current() !== target) return null;
+return [...calendar.querySelectorAll('td.available')].find(c => c.textContent.trim() === String(day)) || null;
+"""
 
 class VendaExtractor:
     """Extrator de vendas do SimplesVet"""
     def __init__(self, webdriver_manager: WebDriverManager, config: Config):
         self.webdriver_manager = webdriver_manager
         self.config = config
+        # Gravação das planilhas em segundo plano: o navegador segue para o próximo mês enquanto
+        # o Excel é serializado (um único worker mantém as gravações em ordem). Criado sob demanda,
+        # para que o extrator continue utilizável depois de close()
+        self._excel_pool: Optional[ThreadPoolExecutor] = None
 
-    def extract_vendas(self, start_date: str, end_date: str, month_str: str = None) -> str:
+    def close(self):
+        """Conclui as gravações pendentes e encerra o worker de gravação"""
+        if self._excel_pool is not None:
+            self._excel_pool.shutdown(wait=True)
+            self._excel_pool = None
+
+    def extract_vendas(self, start_date: str, end_date: str, month_str: str = None) -> Optional[Future]:
         """
         Extrai vendas do SimplesVet para o período informado e salva como Excel filtrado
-        Retorna o caminho do arquivo Excel gerado
+        Retorna um Future com o caminho do Excel gerado (None se a gravação falhar),
+        ou None se as vendas não puderem ser extraídas
         """
         logger.info(f"Iniciando extração de vendas de {start_date} até {end_date}")
         driver = self.webdriver_manager.driver
@@ -29,163 +143,238 @@ class VendaExtractor:
             return None
 
         # Navega para página de vendas
-        vendas_url = "https://app.simples.vet/principal/venda/venda.php"
-        self.webdriver_manager.navigate_to(vendas_url)
-        time.sleep(3)
+        self.webdriver_manager.navigate_to(VENDAS_URL)
+        # Esperas explícitas: cada passo segue assim que o elemento seguinte estiver pronto
+        wait = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_INTERVAL)
 
         # Seleciona o período simulando cliques no calendário
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        import calendar
         try:
             # 1. Clica no campo de data
-            date_field = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "p__ven_dat_data_text"))
-            )
+            date_field = wait.until(EC.element_to_be_clickable(LOCATORS['date_field']))
             date_field.click()
-            time.sleep(1)
 
             # 2. Seleciona "Selecionar período" no menu
-            periodo_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//li[contains(text(),'Selecionar período')]"))
-            )
+            periodo_btn = wait.until(EC.element_to_be_clickable(LOCATORS['period_li']))
             periodo_btn.click()
-            time.sleep(1)
+            wait.until(EC.visibility_of_element_located(LOCATORS['calendar_header']))
 
             # 3. Seleciona datas nos minicalendários
             def select_calendar_date(calendar_side, target_date):
                 # calendar_side: 'left' ou 'right'
                 # target_date: datetime.date
-                # Localiza o calendário
-                cal_selector = f".calendar.{calendar_side} table"
-                while True:
-                    # Lê o mês/ano atual do calendário
-                    month_header = driver.find_element(By.CSS_SELECTOR, f".calendar.{calendar_side} th[colspan='5']")
-                    month_text = month_header.text.strip()
-                    # Exemplo: 'Outubro 2025'
-                    month_map = {
-                        'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 'Maio': 5, 'Junho': 6,
-                        'Julho': 7, 'Agosto': 8, 'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12
-                    }
-                    mes_nome, ano = month_text.split()
-                    mes_atual = month_map.get(mes_nome, 0)
-                    ano_atual = int(ano)
-                    # Compara com target_date
-                    if mes_atual == target_date.month and ano_atual == target_date.year:
-                        break
-                    # Navega para o mês correto
-                    if (ano_atual, mes_atual) < (target_date.year, target_date.month):
-                        # Próximo mês
-                        next_btn = driver.find_element(By.CSS_SELECTOR, f".calendar.{calendar_side} th.next")
-                        next_btn.click()
-                        time.sleep(0.5)
-                    else:
-                        # Mês anterior
-                        prev_btn = driver.find_element(By.CSS_SELECTOR, f".calendar.{calendar_side} th.prev")
-                        prev_btn.click()
-                        time.sleep(0.5)
+                cal_prefix = CALENDAR_SELECTORS[calendar_side]
+                # Caminho rápido: navegação feita dentro da página num único comando; o dia é
+                # clicado pelo WebDriver, que gera os eventos de mouse reais
+                day_cell = driver.execute_script(
+                    CALENDAR_SELECT_JS, cal_prefix, CALENDAR_HEADER_SELECTOR, MONTH_NAMES,
+                    target_date.year, target_date.month, target_date.day, CALENDAR_MAX_CLICKS
+                )
+                if day_cell:
+                    day_cell.click()
+                    return
+                logger.debug("Seleção via script falhou no calendário %s, tentando passo a passo", calendar_side)
+
+                # Cabeçalho com o mês/ano exibido no calendário
+                header_selector = f"{cal_prefix} {CALENDAR_HEADER_SELECTOR}"
+
+                def header_changed(previous):
+                    # Condição de espera: devolve o novo cabeçalho assim que ele for diferente
+                    def condition(d):
+                        text = d.find_element(By.CSS_SELECTOR, header_selector).text.strip()
+                        return text if text and text != previous else False
+                    return condition
+
+                # Lê o mês/ano atual do calendário uma única vez (exemplo: 'Outubro 2025')
+                month_text = driver.find_element(By.CSS_SELECTOR, header_selector).text.strip()
+                mes_nome, ano = month_text.split()
+                if mes_nome not in MONTH_NUMBERS:
+                    logger.warning(f"Formato de mês inesperado: {month_text}")
+                    return
+                delta = (target_date.year - int(ano)) * 12 + (target_date.month - MONTH_NUMBERS[mes_nome])
+                if delta:
+                    # Clica |delta| vezes na seta; cada clique aguarda o cabeçalho mudar em vez de
+                    # dormir um tempo fixo (o calendário re-renderiza, então a seta é buscada de novo)
+                    nav_selector = f"{cal_prefix} th.{'next' if delta > 0 else 'prev'}"
+                    for _ in range(min(abs(delta), CALENDAR_MAX_CLICKS)):
+                        driver.find_element(By.CSS_SELECTOR, nav_selector).click()
+                        month_text = WebDriverWait(driver, 2, poll_frequency=WAIT_POLL_INTERVAL).until(
+                            header_changed(month_text)
+                        )
                 # Seleciona o dia
-                day_cells = driver.find_elements(By.CSS_SELECTOR, f".calendar.{calendar_side} td.available")
+                day_text = str(target_date.day)
+                day_cells = driver.find_elements(By.CSS_SELECTOR, f"{cal_prefix} td.available")
                 for cell in day_cells:
-                    if cell.text.strip() == str(target_date.day):
+                    if cell.text.strip() == day_text:
                         cell.click()
-                        time.sleep(0.5)
                         break
 
             # Converte datas para datetime.date
-            from datetime import datetime as dt
-            start_dt = dt.strptime(start_date, "%Y-%m-%d").date()
-            end_dt = dt.strptime(end_date, "%Y-%m-%d").date()
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
 
             # Seleciona data inicial (calendário da esquerda)
             select_calendar_date('left', start_dt)
             # Seleciona data final (calendário da direita)
             select_calendar_date('right', end_dt)
-            time.sleep(1)
         except Exception as e:
             logger.warning(f"Não foi possível selecionar o período: {e}")
 
         # Clica no botão de relatório
         try:
-            relatorio_btn = driver.find_element(By.ID, "p__btn_relatorio")
+            relatorio_btn = wait.until(EC.element_to_be_clickable(LOCATORS['relatorio_btn']))
             relatorio_btn.click()
-            time.sleep(1)
         except Exception as e:
             logger.warning(f"Não foi possível clicar no botão de relatório: {e}")
 
+        download_dir = setup_download_directory()
+        if not download_dir:
+            logger.error("Erro ao configurar diretório de download")
+            return None
+
         # Clica em exportar para CSV
         try:
-            export_btn = driver.find_element(By.CSS_SELECTOR, "a.p__btn_exportar[rel='xls_vendas']")
+            export_btn = wait.until(EC.element_to_be_clickable(LOCATORS['export_btn']))
+            click_time = time.time()
             export_btn.click()
             logger.info("Exportando vendas para CSV...")
-            time.sleep(5)
         except Exception as e:
             logger.error(f"Não foi possível exportar para CSV: {e}")
             return None
 
-        # Aguarda download do CSV (agora em scrapper, precisa subir 3 níveis para raiz)
-        download_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "downloads")
-        csv_file = self._wait_for_csv_download(download_dir, timeout=30)
+        # Aguarda o download começar em vez de esperar um tempo fixo
+        self._wait_for_download_start(download_dir, click_time)
+
+        # Aguarda download do CSV
+        csv_file = self._wait_for_csv_download(download_dir, timeout=30, since=click_time)
         if not csv_file:
             logger.error("CSV de vendas não encontrado")
             return None
 
         # Filtra e salva como Excel
-        excel_file = self._filter_and_save_csv(csv_file, month_str)
-        return excel_file
+        return self._filter_and_save_csv(csv_file, month_str)
 
-    def _wait_for_csv_download(self, download_dir: str, timeout: int = 30) -> str:
-        """Aguarda o download do CSV de vendas"""
+    def _wait_for_download_start(self, download_dir: str, since: float,
+                                 timeout: int = DOWNLOAD_START_TIMEOUT) -> bool:
+        """Aguarda o navegador começar (ou terminar) o download do CSV após o clique"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            # Temporário ou CSV criado/alterado a partir do clique (ignora restos de execuções antigas)
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(PARTIAL_DOWNLOAD_SUFFIXES + ('.csv',)):
+                        continue
+                    # O navegador renomeia/remove arquivos durante a varredura
+                    try:
+                        if entry.stat().st_mtime >= since:
+                            return True
+                    except FileNotFoundError:
+                        continue
+            time.sleep(DOWNLOAD_START_POLL_INTERVAL)
+        
+        logger.warning(f"Download do CSV não iniciou em {timeout}s, aguardando mesmo assim...")
+        return False
+
+    def _wait_for_csv_download(self, download_dir: str, timeout: int = 30, since: float = 0) -> str:
+        """Aguarda o download do CSV de vendas (o mais recente, modificado a partir de `since`)"""
         logger.info(f"Aguardando download do CSV em: {download_dir}")
         start_time = time.time()
         while time.time() - start_time < timeout:
-            time.sleep(2)
-            files = [f for f in os.listdir(download_dir) if f.endswith('.csv')]
-            if files:
-                # Pega o mais recente
-                files = sorted(files, key=lambda f: os.path.getmtime(os.path.join(download_dir, f)), reverse=True)
-                file_path = os.path.join(download_dir, files[0])
-                logger.info(f"CSV encontrado: {file_path}")
-                return file_path
+            time.sleep(CSV_POLL_INTERVAL)
+            
+            # Uma única varredura por ciclo: o stat vem junto com a entrada do diretório
+            latest = None
+            downloading = False
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    is_partial = entry.name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)
+                    if not is_partial and not entry.name.endswith('.csv'):
+                        continue
+                    # O navegador renomeia/remove arquivos durante a varredura
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    # Arquivos anteriores a `since` (inclusive temporários de downloads
+                    # interrompidos, que nunca somem) não pertencem a este download
+                    if mtime < since:
+                        continue
+                    if is_partial:
+                        downloading = True
+                    elif latest is None or mtime > latest[0]:
+                        latest = (mtime, entry.path)
+            
+            # Só devolve o CSV quando não há download parcial em andamento
+            if latest and not downloading:
+                logger.info(f"CSV encontrado: {latest[1]}")
+                return latest[1]
         return None
 
-    def _filter_and_save_csv(self, csv_path: str, month_str: str = None) -> str:
-        """Filtra colunas do CSV e salva como Excel"""
+    @staticmethod
+    def _detect_csv_encoding(csv_path: str) -> str:
+        """Retorna 'utf-8' se o início do CSV for UTF-8 válido, senão 'latin1'"""
+        with open(csv_path, 'rb') as f:
+            sample = f.read(ENCODING_SNIFF_BYTES)
+        try:
+            sample.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # Erro só nos últimos bytes = caractere multibyte cortado pelo limite da amostra
+            if e.start < len(sample) - 3:
+                return 'latin1'
+        return 'utf-8'
+
+    @staticmethod
+    def _is_decode_error(error: ValueError) -> bool:
+        """Indica se o erro de leitura do CSV veio de bytes que não são UTF-8 válido"""
+        if isinstance(error, UnicodeDecodeError):
+            return True
+        return CSV_ENGINE == 'pyarrow' and PYARROW_INVALID_UTF8 in str(error).lower()
+
+    def _filter_and_save_csv(self, csv_path: str, month_str: str = None) -> Future:
+        """
+        Filtra colunas do CSV e agenda a gravação do Excel em segundo plano
+        Retorna o Future da gravação, que resolve para o caminho do Excel ou None em caso de erro
+        """
         logger.info(f"Filtrando CSV: {csv_path}")
-        # Tenta ler em utf-8, se falhar tenta latin1
+        # Detecta a codificação pelo início do arquivo, evitando ler o CSV inteiro duas vezes
+        encoding = self._detect_csv_encoding(csv_path)
         try:
-            df = pd.read_csv(csv_path, sep=';', encoding='utf-8')
-        except UnicodeDecodeError:
-            logger.debug("CSV não está em UTF-8, usando latin1...")
-            df = pd.read_csv(csv_path, sep=';', encoding='latin1')
-        # Colunas desejadas
-        columns = [
-            'Data e hora', 'Venda', 'Status da venda', 'Funcionário', 'Cliente', 'Animal',
-            'Tipo do Item', 'Grupo', 'Produto/serviço', 'Valor Unitário', 'Quantidade', 'Bruto', 'Desconto', 'Líquido'
-        ]
+            df = pd.read_csv(csv_path, sep=';', encoding=encoding, engine=CSV_ENGINE,
+                             **CSV_READ_OPTIONS)
+        except ValueError as e:
+            # Byte inválido depois da amostra. Só erros de decodificação justificam reler como
+            # latin1: erros de tokenização ou de tipo seguem adiante
+            if encoding == 'latin1' or not self._is_decode_error(e):
+                raise
+            logger.warning(f"CSV não está em UTF-8 ({e}), usando latin1...")
+            df = pd.read_csv(csv_path, sep=';', encoding='latin1', engine=CSV_ENGINE,
+                             **CSV_READ_OPTIONS)
         # Filtra e cria uma cópia explícita para evitar SettingWithCopyWarning
-        df_filtered = df[[col for col in columns if col in df.columns]].copy()
+        df_filtered = df[[col for col in VENDAS_COLUMNS if col in df.columns]].copy()
         
-        # Converte colunas financeiras e quantidade para número
-        num_cols = ['Valor Unitário', 'Quantidade', 'Bruto', 'Desconto', 'Líquido']
-        for col in num_cols:
-            if col in df_filtered.columns:
-                df_filtered[col] = (
-                    df_filtered[col]
-                    .astype(str)
-                    .str.replace('.', '', regex=False)
-                    .str.replace(',', '.', regex=False)
-                    .str.replace(r'[^0-9.-]', '', regex=True)
-                )
-                df_filtered[col] = pd.to_numeric(df_filtered[col], errors='coerce')
+        # Converte para número, numa única passada, as colunas financeiras e quantidade que a
+        # leitura não converteu (pyarrow, ou valores com texto extra como 'R$')
+        numeric_cols = [
+            col for col in NUMERIC_COLUMNS
+            if col in df_filtered.columns and not pd.api.types.is_numeric_dtype(df_filtered[col])
+        ]
+        if numeric_cols:
+            # Uma passada por valor: descarta tudo exceto dígitos, vírgula e sinal (inclusive o
+            # separador de milhar) e troca a vírgula decimal por ponto
+            values = df_filtered[numeric_cols].to_numpy(dtype=str).ravel()
+            numbers = pd.to_numeric(
+                [NON_NUMERIC_RE.sub('', value).replace(',', '.') for value in values],
+                errors='coerce'
+            )
+            df_filtered[numeric_cols] = numbers.reshape(-1, len(numeric_cols))
         # Salva como Excel
         if month_str:
             excel_path = os.path.join(os.path.dirname(csv_path), f"{month_str}-vendas.xlsx")
         else:
             excel_path = csv_path.replace('.csv', '.xlsx')
-        df_filtered.to_excel(excel_path, index=False)
-        logger.info(f"✅ Excel de vendas criado: {excel_path}")
+        if self._excel_pool is None:
+            self._excel_pool = ThreadPoolExecutor(max_workers=1)
+        write = self._excel_pool.submit(self._write_excel, df_filtered, excel_path)
+        # O CSV já foi lido por completo, então pode ser removido sem esperar a gravação.
         # Remove o CSV original se for Vendas.csv
         try:
             base_csv = os.path.basename(csv_path).lower()
@@ -194,4 +383,15 @@ class VendaExtractor:
                 logger.info(f"🗑️  Vendas.csv removido após conversão!")
         except Exception as e:
             logger.warning(f"Erro ao remover Vendas.csv: {e}")
-        return excel_path
+        return write
+
+    @staticmethod
+    def _write_excel(df: pd.DataFrame, excel_path: str) -> Optional[str]:
+        """Grava a planilha de vendas (executado no worker de gravação)"""
+        try:
+            df.to_excel(excel_path, index=False, engine=EXCEL_ENGINE)
+            logger.info(f"✅ Excel de vendas criado: {excel_path}")
+            return excel_path
+        except Exception as e:
+            logger.error(f"Erro ao gravar Excel de vendas {excel_path}: {e}")
+            return None
@@ -9,14 +9,55 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
-import time
-import os
 from typing import Optional
+from urllib.parse import urlparse
+import os
+import re
 from .logger import logger
+from .download_utils import setup_download_directory
+
+# Diretório 'drivers' na raiz do projeto (em src/scrapper, precisa subir 3 níveis)
+DRIVERS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "drivers"
+)
+
+# Arquivo com o caminho do chromedriver obtido na última instalação pelo webdriver_manager
+CHROMEDRIVER_PATH_FILE = os.path.join(DRIVERS_DIR, "chromedriver_path.txt")
+
+# Padrões de URL bloqueados no Chrome via CDP: fontes e rastreadores não são usados pela automação
+# (o CSS continua liberado, as esperas dependem de visibilidade)
+DEFAULT_BLOCKED_URLS = (
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*hotjar.com*', '*facebook.net*', '*clarity.ms*',
+)
+
+# Identifica a tela de login pela URL ou pelo título (sem criar cópias em minúsculas a cada verificação)
+LOGIN_RE = re.compile(r'login', re.IGNORECASE)
+
+# Testa uma lista de seletores CSS no próprio navegador e retorna [seletor, elemento] do primeiro
+# que encontrar algo (respeita a ordem de preferência com um único comando por verificação)
+FIRST_MATCH_JS = """
+for (const selector of arguments[0]) {
+    const element = document.querySelector(selector);
+    if (element) return [selector, element];
+}
+return null;
+"""
+
+# Define o valor de um campo e dispara os eventos que os frameworks de formulário escutam
+SET_INPUT_VALUE_JS = """
+arguments[0].value = arguments[1];
+arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
+arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
+"""
 
 
 class WebDriverManager:
-    def __init__(self, browser_type: str = 'chrome', headless: bool = False, wait_timeout: int = 10):
+    def __init__(self, browser_type: str = 'chrome', headless: bool = False, wait_timeout: int = 10,
+                 download_dir: Optional[str] = None, disable_images: bool = True,
+                 user_data_dir: Optional[str] = None, page_load_strategy: str = 'normal',
+                 blocked_urls: Optional[list] = None):
         """
         Inicializa o gerenciador do WebDriver
         
@@ -24,12 +65,23 @@ class WebDriverManager:
             browser_type: Tipo do navegador ('chrome' ou 'firefox')
             headless: Se deve executar em modo headless
             wait_timeout: Timeout padrão para esperas
+            download_dir: Diretório de download (padrão: 'downloads' na raiz do projeto)
+            disable_images: Se deve bloquear o carregamento de imagens (páginas carregam mais rápido)
+            user_data_dir: Perfil persistente do Chrome (mantém cookies e cache entre execuções)
+            page_load_strategy: Quando get() retorna ('normal': página completa, 'eager': DOM pronto)
+            blocked_urls: Padrões de URL bloqueados no Chrome (padrão: DEFAULT_BLOCKED_URLS; [] desativa)
         """
         self.browser_type = browser_type.lower()
         self.headless = headless
         self.wait_timeout = wait_timeout
+        self.download_dir = download_dir
+        self.disable_images = disable_images
+        self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.page_load_strategy = page_load_strategy
+        self.blocked_urls = list(DEFAULT_BLOCKED_URLS if blocked_urls is None else blocked_urls)
         self.driver: Optional[webdriver.Chrome | webdriver.Firefox] = None
         self.wait: Optional[WebDriverWait] = None
+        self.user_agent: Optional[str] = None
     
     def start_browser(self) -> bool:
         """
@@ -41,6 +93,7 @@ class WebDriverManager:
         try:
             if self.browser_type == 'chrome':
                 self._start_chrome()
+                self._block_urls()
             elif self.browser_type == 'firefox':
                 self._start_firefox()
             else:
@@ -58,55 +111,124 @@ class WebDriverManager:
     def _start_chrome(self):
         """Inicia o Chrome"""
         options = ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
         
         if self.headless:
-            options.add_argument('--headless')
+            # Novo modo headless do Chrome (mesmo motor do modo com janela)
+            options.add_argument('--headless=new')
+        
+        prefs = {}
         
         # Configura diretório de download
-        download_dir = self._get_download_directory()
+        download_dir = self.download_dir or setup_download_directory()
         if download_dir:
-            prefs = {
+            prefs.update({
                 "download.default_directory": download_dir,
                 "download.prompt_for_download": False,
                 "download.directory_upgrade": True,
                 "safebrowsing.enabled": True
-            }
-            options.add_experimental_option("prefs", prefs)
+            })
+        
+        # Imagens não são usadas pela automação (CSS continua, as esperas dependem de visibilidade)
+        if self.disable_images:
+            prefs["profile.managed_default_content_settings.images"] = 2
+        
+        # Bloqueia pedidos de notificação dos sites
+        prefs["profile.default_content_setting_values.notifications"] = 2
+        
+        options.add_experimental_option("prefs", prefs)
         
         # Opções para melhor compatibilidade e performance
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        # Desliga tráfego de fundo do Chrome (atualizações de componentes, sincronização, tradutor)
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-sync')
+        options.add_argument('--disable-features=Translate,BackForwardCache')
+        # Janelas em segundo plano (como o navegador auxiliar) não têm timers nem renderização reduzidos
+        options.add_argument('--disable-background-timer-throttling')
+        options.add_argument('--disable-renderer-backgrounding')
         options.add_argument('--window-size=1920,1080')
+        
+        # Perfil persistente: a sessão e o cache HTTP do SimplesVet sobrevivem entre execuções.
+        # O Chrome recusa um perfil já em uso, então execuções simultâneas precisam de perfis distintos
+        if self.user_data_dir:
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            options.add_argument(f'--user-data-dir={self.user_data_dir}')
         options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
-        service = ChromeService(ChromeDriverManager().install())
+        cached_path = self._cached_chromedriver_path()
+        if cached_path:
+            try:
+                self.driver = webdriver.Chrome(service=ChromeService(cached_path), options=options)
+                return
+            except WebDriverException as e:
+                # Driver em cache incompatível (ex.: Chrome atualizado), reinstala abaixo
+                logger.warning(f"Chromedriver em cache falhou, reinstalando: {e}")
+        
+        driver_path = ChromeDriverManager().install()
+        self._save_chromedriver_path(driver_path)
+        service = ChromeService(driver_path)
         self.driver = webdriver.Chrome(service=service, options=options)
     
-    def _get_download_directory(self) -> Optional[str]:
-        """Obtém o diretório de download do projeto"""
+    @staticmethod
+    def _cached_chromedriver_path() -> Optional[str]:
+        """
+        Lê o caminho do chromedriver salvo na última instalação
+        
+        Returns:
+            Caminho do executável se ainda existir, ou None
+        """
         try:
-            # Cria diretório 'downloads' no projeto se não existir (agora em scrapper, precisa subir 3 níveis)
-            current_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-            download_dir = os.path.join(current_dir, "downloads")
-            
-            if not os.path.exists(download_dir):
-                os.makedirs(download_dir)
-                logger.info(f"Diretório de download criado: {download_dir}")
-            
-            return download_dir
-            
-        except Exception as e:
-            logger.error(f"Erro ao configurar diretório de download: {str(e)}")
+            with open(CHROMEDRIVER_PATH_FILE, 'r', encoding='utf-8') as f:
+                driver_path = f.read().strip()
+        except OSError:
             return None
+        
+        if driver_path and os.access(driver_path, os.X_OK):
+            return driver_path
+        return None
+    
+    @staticmethod
+    def _save_chromedriver_path(driver_path: str):
+        """
+        Salva o caminho do chromedriver para as próximas execuções
+        
+        Args:
+            driver_path: Caminho retornado por ChromeDriverManager().install()
+        """
+        tmp_path = CHROMEDRIVER_PATH_FILE + '.tmp'
+        try:
+            os.makedirs(DRIVERS_DIR, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(driver_path)
+            os.replace(tmp_path, CHROMEDRIVER_PATH_FILE)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar o caminho do chromedriver: {e}")
+    
+    def _block_urls(self):
+        """Bloqueia no nível do protocolo (CDP) as requisições que casam com blocked_urls"""
+        if not self.blocked_urls:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        except WebDriverException as e:
+            logger.warning(f"Não foi possível bloquear URLs no navegador: {e}")
     
     def _start_firefox(self):
         """Inicia o Firefox"""
         options = FirefoxOptions()
+        options.page_load_strategy = self.page_load_strategy
         
         if self.headless:
             options.add_argument('--headless')
         
+        if self.disable_images:
+            options.set_preference("permissions.default.image", 2)
+        
         options.set_preference("general.useragent.override", 
                              "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0")
         
@@ -129,14 +251,63 @@ class WebDriverManager:
                 return False
             
             logger.info(f"Navegando para: {url}")
+            # get() bloqueia até o carregamento do documento (ou só do DOM, com page_load_strategy
+            # 'eager'); quem precisa de um elemento específico aguarda por ele com WebDriverWait
             self.driver.get(url)
-            time.sleep(2)  # Aguarda a página carregar
             return True
             
         except Exception as e:
             logger.error(f"Erro ao navegar para {url}: {e}")
             return False
     
+    def copy_cookies_from(self, other: 'WebDriverManager', url: str) -> bool:
+        """
+        Copia os cookies de outro navegador (reaproveita a sessão autenticada) e carrega url com eles
+        
+        Args:
+            other: Gerenciador cujo navegador já está logado
+            url: Página a carregar com a sessão copiada (também define o domínio dos cookies)
+            
+        Returns:
+            True se os cookies foram copiados e url abriu autenticada (sem cair no login)
+        """
+        if not self.driver or not other.driver:
+            logger.error("Navegador não foi iniciado")
+            return False
+        
+        try:
+            # add_cookie só aceita cookies do domínio aberto; a partir do segundo mês o navegador já está nele
+            if urlparse(self.driver.current_url).netloc != urlparse(url).netloc:
+                self.driver.get(url)
+            added = 0
+            missing_session = []
+            for cookie in other.driver.get_cookies():
+                try:
+                    self.driver.add_cookie(cookie)
+                    added += 1
+                except Exception as e:
+                    logger.debug("Cookie %s não copiado: %s", cookie.get('name'), e)
+                    # Cookies sem expiração são os de sessão, que carregam o login
+                    if 'expiry' not in cookie:
+                        missing_session.append(cookie.get('name'))
+            
+            if not added:
+                logger.warning("Nenhum cookie foi copiado")
+                return False
+            if missing_session:
+                logger.warning(f"Cookies de sessão não copiados: {', '.join(missing_session)}")
+                return False
+            
+            # Carrega a página já com a sessão; sem ela o SimplesVet redireciona para o login
+            self.driver.get(url)
+            if LOGIN_RE.search(self.driver.current_url):
+                logger.warning("Sessão copiada não foi aceita (redirecionado para o login)")
+                return False
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao copiar cookies: {e}")
+            return False
+    
     def find_element_by_selectors(self, selectors: list, timeout: Optional[int] = None) -> Optional[object]:
         """
         Encontra um elemento usando múltiplos seletores
@@ -153,18 +324,18 @@ class WebDriverManager:
         
         timeout = timeout or self.wait_timeout
         
-        for selector in selectors:
-            try:
-                wait = WebDriverWait(self.driver, timeout)
-                element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                logger.debug(f"Elemento encontrado com seletor: {selector}")
-                return element
-            except TimeoutException:
-                logger.debug(f"Elemento não encontrado com seletor: {selector}")
-                continue
-        
-        logger.warning(f"Nenhum elemento encontrado com os seletores fornecidos")
-        return None
+        def first_match(driver):
+            # Testa todos os seletores a cada verificação, na ordem de preferência
+            return driver.execute_script(FIRST_MATCH_JS, list(selectors)) or False
+        
+        # Uma única espera para a lista inteira: o timeout vale para o total, não por seletor
+        try:
+            selector, element = WebDriverWait(self.driver, timeout).until(first_match)
+            logger.debug("Elemento encontrado com seletor: %s", selector)
+            return element
+        except TimeoutException:
+            logger.warning(f"Nenhum elemento encontrado com os seletores fornecidos")
+            return None
     
     def wait_for_element_clickable(self, selector: str, timeout: Optional[int] = None) -> Optional[object]:
         """
@@ -189,6 +360,17 @@ class WebDriverManager:
             logger.warning(f"Elemento não ficou clicável: {selector}")
             return None
     
+    def get_user_agent(self) -> Optional[str]:
+        """
+        Obtém o User-Agent do navegador (consultado uma única vez por sessão)
+        
+        Returns:
+            User-Agent ou None
+        """
+        if self.user_agent is None and self.driver:
+            self.user_agent = self.driver.execute_script("return navigator.userAgent;")
+        return self.user_agent
+    
     def get_current_url(self) -> Optional[str]:
         """
         Obtém a URL atual
@@ -211,6 +393,24 @@ class WebDriverManager:
             return self.driver.title
         return None
     
+    def set_input_value(self, element, value: str) -> bool:
+        """
+        Preenche um campo com um único comando, em vez de clear() + um evento por caractere
+        
+        Args:
+            element: Campo de entrada
+            value: Valor a preencher
+            
+        Returns:
+            True se o valor foi definido
+        """
+        try:
+            self.driver.execute_script(SET_INPUT_VALUE_JS, element, value)
+            return True
+        except WebDriverException as e:
+            logger.debug("Falha ao definir valor do campo via script: %s", e)
+            return False
+    
     def close_browser(self):
         """Fecha o navegador"""
         if self.driver:
@@ -222,7 +422,4 @@ class WebDriverManager:
             finally:
                 self.driver = None
                 self.wait = None
-    
-    def __del__(self):
-        """Destrutor - garante que o navegador seja fechado"""
-        self.close_browser()
\ No newline at end of file
+                self.user_agent = None
\ No newline at end of file
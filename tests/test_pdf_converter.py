@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import pdfplumber  # noqa: F401 (dependência do conversor)
+except ImportError:
+    pdfplumber = None
+
+# Logs dos testes vão para um diretório temporário, não para logs/ do repositório.
+# Precisa valer antes do primeiro import de src.scrapper (o logger global é criado no import)
+_LOG_DIR = tempfile.TemporaryDirectory()
+os.environ.setdefault('SIMPLESVET_LOG_DIR', _LOG_DIR.name)
+
+# Agendamentos como o parser os gera a partir das tabelas do relatório do SimplesVet
+APPOINTMENTS_FIXTURE = [
+    {'veterinario': 'Dra. Ana Souza', 'cliente': 'Maria Silva', 'animal': 'Rex',
+     'tipo_atendimento': 'Consulta', 'data': '01/10/2025', 'hora': '09:00', 'status': 'Atendido'},
+    {'veterinario': 'Dra. Ana Souza', 'cliente': 'João Lima', 'animal': 'Mimi',
+     'tipo_atendimento': 'Vacina', 'data': '01/10/2025', 'hora': '10:30', 'status': 'Agendado'},
+    {'veterinario': 'Dr. Paulo Reis', 'cliente': 'Carla Dias', 'animal': 'Thor',
+     'tipo_atendimento': 'Retorno', 'data': '02/10/2025', 'hora': '14:00', 'status': 'Cancelado'},
+]
+
+
+@unittest.skipIf(pdfplumber is None, "pdfplumber não instalado")
+class ConvertPdfToExcelTest(unittest.TestCase):
+    def setUp(self):
+        from src.scrapper.pdf_converter import PDFConverter
+        self.converter = PDFConverter()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.tmp_dir.name, '202510-agendamentos.pdf')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def convert(self, appointments):
+        with mock.patch.object(type(self.converter), '_iter_appointments_from_pdf',
+                               return_value=iter(appointments)):
+            return self.converter.convert_pdf_to_excel(self.pdf_path, '202510')
+
+    def test_returns_row_count_of_written_excel(self):
+        from openpyxl import load_workbook
+
+        excel_path, count = self.convert(APPOINTMENTS_FIXTURE)
+
+        self.assertEqual(count, len(APPOINTMENTS_FIXTURE))
+        self.assertTrue(os.path.exists(excel_path))
+
+        # A planilha write-only não grava <dimension>: sem reset_dimensions o max_row seria None
+        wb = load_workbook(excel_path, read_only=True)
+        try:
+            ws = wb.active
+            ws.reset_dimensions()
+            data_rows = sum(1 for _ in ws.iter_rows(min_row=2, values_only=True))
+        finally:
+            wb.close()
+        self.assertEqual(data_rows, count)
+
+    def test_empty_pdf_returns_zero(self):
+        self.assertEqual(self.convert([]), (None, 0))
+
+
+# Tabela como o pdfplumber a extrai de uma página do relatório: título, cabeçalho,
+# agendamentos e linhas de observação/sem data que o parser deve descartar
+TABLE_FIXTURE = [
+    ['Agenda do dia', None, None, None, None, None],
+    ['Cliente', 'Animal', 'Tipo de atendimento', 'Data', 'Hora', 'Status'],
+    [' Maria Silva ', 'Rex', 'Consulta', '01/10/2025', '09:00', 'Atendido'],
+    ['Paga na hora', None, None, None, None, None],
+    ['João Lima', 'Mimi', 'Vacina', '31/09/2025', '10:30', 'Agendado'],
+    [None, '', None, None, None, None],
+    ['', '', 'Retorno', '02/10/2025', '11:00', 'Agendado'],
+    ['Carla Dias', None, 'Retorno', '02/10/2025', '14:00', 'Cancelado'],
+]
+
+PAGE_TEXT_FIXTURE = "Agenda do dia\nDRA. ANA SOUZA\nCliente Animal Data Hora Status\nDR. PAULO REIS\n"
+
+
+@unittest.skipIf(pdfplumber is None, "pdfplumber não instalado")
+class ParseSimplesvetTableTest(unittest.TestCase):
+    def setUp(self):
+        from src.scrapper.pdf_converter import PDFConverter
+        self.converter = PDFConverter()
+
+    def test_parses_rows_after_header(self):
+        appointments = self.converter._parse_simplesvet_table(TABLE_FIXTURE, 'DRA. ANA SOUZA')
+
+        self.assertEqual(appointments, [
+            {'veterinario': 'DRA. ANA SOUZA', 'cliente': 'Maria Silva', 'animal': 'Rex',
+             'tipo_atendimento': 'Consulta', 'data': '01/10/2025', 'hora': '09:00', 'status': 'Atendido'},
+            {'veterinario': 'DRA. ANA SOUZA', 'cliente': 'Carla Dias', 'animal': '',
+             'tipo_atendimento': 'Retorno', 'data': '02/10/2025', 'hora': '14:00', 'status': 'Cancelado'},
+        ])
+
+    def test_table_without_header_returns_nothing(self):
+        table = [['Maria Silva', 'Rex', '01/10/2025'], ['João Lima', 'Mimi', '02/10/2025']]
+        self.assertEqual(self.converter._parse_simplesvet_table(table), [])
+
+    def test_tables_get_veterinarians_from_page_text(self):
+        tables = [TABLE_FIXTURE, None, TABLE_FIXTURE[1:3]]
+
+        appointments = list(self.converter._iter_tables_appointments(
+            tables, lambda: PAGE_TEXT_FIXTURE, 0))
+
+        self.assertEqual([a['veterinario'] for a in appointments],
+                         ['DRA. ANA SOUZA', 'DRA. ANA SOUZA', 'DR. PAULO REIS'])
+        self.assertEqual(len(appointments), 3)
+
+    def test_extract_veterinario_names(self):
+        self.assertEqual(self.converter._extract_veterinario_names(PAGE_TEXT_FIXTURE),
+                         ['DRA. ANA SOUZA', 'DR. PAULO REIS'])
+
+    def test_is_valid_date(self):
+        for date_str in ('01/10/2025', '31/12/2025', '29/02/2024', '01/01/0001'):
+            with self.subTest(date_str=date_str):
+                self.assertTrue(self.converter._is_valid_date(date_str))
+        for date_str in ('', '  ', '1/10/2025', '01/10/25', '31/09/2025', '29/02/2025',
+                         '00/10/2025', '01/13/2025', '01/01/0000', ' 01/10/2025',
+                         '01/10/2025\n', '01-10-2025', '٠١/١٠/٢٠٢٥'):
+            with self.subTest(date_str=date_str):
+                self.assertFalse(self.converter._is_valid_date(date_str))
+
+
+if __name__ == '__main__':
+    unittest.main()